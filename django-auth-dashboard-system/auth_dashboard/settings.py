@@ -76,8 +76,19 @@ WSGI_APPLICATION = 'auth_dashboard.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'auth_dashboard.sqlite_backend',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'pragmas': {
+                'journal_mode': 'WAL',
+                'synchronous': 'NORMAL',
+                'busy_timeout': 5000,
+                'cache_size': -20000,
+                'mmap_size': 134217728,
+                'temp_store': 'MEMORY',
+            },
+        },
     }
 }
 
@@ -87,6 +98,26 @@ DATABASES = {
 
 AUTH_PASSWORD_VALIDATORS = []
 
+# ProfileModelBackend only resolves sessions (views log users in through it); ModelBackend
+# checks passwords and keeps sessions created before ProfileModelBackend resolving
+AUTHENTICATION_BACKENDS = [
+    'users.backends.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# Password hashing
+# https://docs.djangoproject.com/en/5.0/topics/auth/passwords/
+
+PASSWORD_HASHERS = [
+    'users.hashers.CalibratedPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+PASSWORD_HASHER_ITERATIONS = None
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
@@ -113,6 +144,19 @@ LOGIN_URL = 'login'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Avatars are re-encoded as JPEG and downscaled before they are stored
+AVATAR_MAX_UPLOAD_SIZE = 5 * 1024 * 1024
+AVATAR_MAX_DIMENSION = 512
+AVATAR_MAX_PIXELS = 40_000_000
+
+# The base64 crop fallback is a plain form field, so the request body cap applies
+# before it is decoded; leave room for the encoded avatar plus the other fields
+DATA_UPLOAD_MAX_MEMORY_SIZE = AVATAR_MAX_UPLOAD_SIZE * 4 // 3 + 64 * 1024
+
+# Responsive thumbnails are built after upload by a small background pool (0 = inline)
+THUMBNAIL_WORKERS = 2
+THUMBNAIL_QUEUE_SIZE = 32
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
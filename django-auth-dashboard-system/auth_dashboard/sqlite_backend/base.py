@@ -0,0 +1,32 @@
+from django.db.backends.signals import connection_created
+from django.db.backends.sqlite3 import base
+from django.dispatch import receiver
+
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    transaction_mode = 'DEFERRED'
+    pragmas = {}
+
+    def get_connection_params(self):
+        options = self.settings_dict['OPTIONS']
+        transaction_mode = (options.get('transaction_mode') or 'DEFERRED').upper()
+        if transaction_mode not in TRANSACTION_MODES:
+            raise ValueError(f'Unsupported SQLite transaction mode: {transaction_mode}')
+        self.transaction_mode = transaction_mode
+        self.pragmas = options.get('pragmas', {})
+        params = super().get_connection_params()
+        params.pop('transaction_mode', None)
+        params.pop('pragmas', None)
+        return params
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f'BEGIN {self.transaction_mode}')
+
+
+@receiver(connection_created, sender=DatabaseWrapper)
+def apply_pragmas(sender, connection, **kwargs):
+    with connection.cursor() as cursor:
+        for name, value in connection.pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
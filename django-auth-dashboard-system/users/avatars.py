@@ -0,0 +1,108 @@
+import base64
+import binascii
+import re
+import tempfile
+from io import BytesIO
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.template.defaultfilters import filesizeformat
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+DATA_URL_RE = re.compile(r'^data:image/(png|jpeg|webp|gif);base64,')
+DECODE_CHUNK_SIZE = 64 * 1024
+SPOOL_SIZE = 1024 * 1024
+
+
+def max_upload_size():
+    return getattr(settings, 'AVATAR_MAX_UPLOAD_SIZE', 5 * 1024 * 1024)
+
+
+def max_dimension():
+    return getattr(settings, 'AVATAR_MAX_DIMENSION', 512)
+
+
+def max_pixels():
+    return getattr(settings, 'AVATAR_MAX_PIXELS', 40_000_000)
+
+
+def too_large_error(limit):
+    return ValidationError(f'Image is too large (maximum {filesizeformat(limit)}).', code='too_large')
+
+
+def decode_base64_chunks(chunks, output, limit):
+    pending = ''
+    written = 0
+    for chunk in chunks:
+        pending += ''.join(chunk.split())
+        usable = len(pending) - len(pending) % 4
+        if not usable:
+            continue
+        try:
+            decoded = base64.b64decode(pending[:usable], validate=True)
+        except binascii.Error:
+            raise ValidationError('Image data is not valid base64.', code='invalid')
+        pending = pending[usable:]
+        written += len(decoded)
+        if written > limit:
+            raise too_large_error(limit)
+        output.write(decoded)
+    if pending:
+        raise ValidationError('Image data is not valid base64.', code='invalid')
+    return written
+
+
+def decode_data_url(data_url, limit=None):
+    limit = max_upload_size() if limit is None else limit
+    match = DATA_URL_RE.match(data_url[:64])
+    if match is None:
+        raise ValidationError('Unsupported image data.', code='invalid')
+    start = match.end()
+    if (len(data_url) - start) * 3 // 4 > limit + 2:
+        raise too_large_error(limit)
+
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+    try:
+        decode_base64_chunks(
+            (data_url[offset:offset + DECODE_CHUNK_SIZE] for offset in range(start, len(data_url), DECODE_CHUNK_SIZE)),
+            output,
+            limit,
+        )
+    except ValidationError:
+        output.close()
+        raise
+    output.seek(0)
+    return output
+
+
+def reencode_avatar(source, name):
+    try:
+        with Image.open(source) as image:
+            if image.width * image.height > max_pixels():
+                raise ValidationError('Image dimensions are too large.', code='too_large')
+            image.draft('RGB', (max_dimension(), max_dimension()))
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((max_dimension(), max_dimension()), Image.Resampling.LANCZOS)
+            if image.mode != 'RGB':
+                rgba = image.convert('RGBA')
+                image = Image.new('RGB', rgba.size, (255, 255, 255))
+                image.paste(rgba, mask=rgba.getchannel('A'))
+            buffer = BytesIO()
+            image.save(buffer, format='JPEG', quality=85, optimize=True)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        raise ValidationError('Upload a valid image.', code='invalid_image')
+    return ContentFile(buffer.getvalue(), name=f'{name}.jpg')
+
+
+def avatar_from_upload(upload, name):
+    limit = max_upload_size()
+    if upload.size > limit:
+        raise too_large_error(limit)
+    upload.seek(0)
+    return reencode_avatar(upload, name)
+
+
+def avatar_from_data_url(data_url, name):
+    with decode_data_url(data_url) as source:
+        return reencode_avatar(source, name)
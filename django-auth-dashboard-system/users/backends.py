@@ -0,0 +1,20 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+SESSION_BACKEND = 'users.backends.ProfileModelBackend'
+
+
+class ProfileModelBackend(ModelBackend):
+    # Resolves sessions only; the ModelBackend listed after it checks passwords,
+    # so a login hashes once and later backends still get their turn
+    def authenticate(self, request, **credentials):
+        return None
+
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related('profile').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -1,7 +1,10 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm, PasswordChangeForm
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
 from .models import UserProfile
+from .avatars import avatar_from_data_url, avatar_from_upload
 
 class SignUpForm(UserCreationForm):
     email = forms.EmailField(required=True, widget=forms.EmailInput(attrs={
@@ -55,6 +58,8 @@ class UserProfileForm(forms.ModelForm):
         'class': 'form-control',
         'placeholder': 'Last Name'
     }))
+    cropped_avatar = forms.FileField(required=False)
+    cropped_image = forms.CharField(required=False, strip=False)
     
     class Meta:
         model = UserProfile
@@ -88,6 +93,21 @@ class UserProfileForm(forms.ModelForm):
         if user:
             self.fields['first_name'].initial = user.first_name
             self.fields['last_name'].initial = user.last_name
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        name = f'avatar_{self.instance.user_id}'
+        picture = cleaned_data.get('profile_picture')
+        try:
+            if cleaned_data.get('cropped_avatar'):
+                cleaned_data['profile_picture'] = avatar_from_upload(cleaned_data['cropped_avatar'], name)
+            elif cleaned_data.get('cropped_image'):
+                cleaned_data['profile_picture'] = avatar_from_data_url(cleaned_data['cropped_image'], name)
+            elif isinstance(picture, UploadedFile):
+                cleaned_data['profile_picture'] = avatar_from_upload(picture, name)
+        except ValidationError as error:
+            self.add_error('profile_picture', error)
+        return cleaned_data
 
 class CustomPasswordChangeForm(PasswordChangeForm):
     old_password = forms.CharField(widget=forms.PasswordInput(attrs={
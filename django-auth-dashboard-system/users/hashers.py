@@ -0,0 +1,8 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class CalibratedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_HASHER_ITERATIONS', None) or PBKDF2PasswordHasher.iterations
@@ -0,0 +1,127 @@
+import multiprocessing
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.contrib.auth import authenticate, login
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.shortcuts import redirect, render
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import include, path, reverse
+from users.forms import LoginForm
+
+BENCHMARK_PASSWORD = 'bench-password-123'
+
+
+def legacy_login_view(request):
+    form = LoginForm(request, data=request.POST)
+    if form.is_valid():
+        user = authenticate(
+            username=form.cleaned_data.get('username'),
+            password=form.cleaned_data.get('password'),
+        )
+        login(request, user)
+        return redirect('dashboard')
+    return render(request, 'users/login.html', {'form': form})
+
+
+urlpatterns = [
+    path('legacy-login/', legacy_login_view, name='legacy_login'),
+    path('', include('auth_dashboard.urls')),
+]
+
+MODES = {
+    'legacy': 'legacy_login',
+    'single': 'login',
+}
+
+
+@contextmanager
+def throwaway_database(users, test_name):
+    settings_dict = connection.settings_dict
+    original = settings_dict['TEST']
+    settings_dict['TEST'] = {**original, 'NAME': test_name}
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        password = make_password(BENCHMARK_PASSWORD)
+        User.objects.bulk_create(
+            [User(username=f'bench_{index:05d}', password=password) for index in range(users)],
+            batch_size=1000,
+        )
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+        settings_dict['TEST'] = original
+
+
+def run_worker(url, usernames, duration, results):
+    client = Client()
+    completed = 0
+    started = time.perf_counter()
+    deadline = started + duration
+    while time.perf_counter() < deadline:
+        username = usernames[completed % len(usernames)]
+        client.cookies.clear()
+        response = client.post(url, {'username': username, 'password': BENCHMARK_PASSWORD})
+        if response.status_code == 302:
+            completed += 1
+    results.put((completed, time.process_time()))
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Measure successful logins/sec through the login view, with the legacy double hash and the single hash path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count())
+        parser.add_argument('--duration', type=float, default=10.0)
+        parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+
+    def handle(self, *args, **options):
+        if options['users'] < 1:
+            raise CommandError('--users must be at least 1')
+        options['workers'] = max(1, min(options['workers'], options['users']))
+        context = multiprocessing.get_context('fork')
+        summary = {}
+        with override_settings(ROOT_URLCONF=__name__):
+            for mode in options['modes']:
+                with tempfile.TemporaryDirectory() as directory:
+                    with throwaway_database(options['users'], str(Path(directory) / 'logins.sqlite3')):
+                        summary[mode] = self.run_mode(context, reverse(MODES[mode]), options)
+                self.stdout.write(f'{mode}: done')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'=== {options["workers"]} workers, {options["users"]} users, {options["duration"]:.0f}s ==='
+        ))
+        self.stdout.write(f'{"mode":<8} {"logins/s":>9} {"cpu ms/login":>13}')
+        for mode, (rate, cpu_ms) in summary.items():
+            self.stdout.write(f'{mode:<8} {rate:>9.1f} {cpu_ms:>13.1f}')
+
+    def run_mode(self, context, url, options):
+        usernames = list(User.objects.order_by('pk').values_list('username', flat=True))
+        connections.close_all()
+
+        results = context.Queue()
+        workers = [
+            context.Process(target=run_worker, args=(url, usernames[index::options['workers']], options['duration'], results))
+            for index in range(options['workers'])
+        ]
+        for worker in workers:
+            worker.start()
+        completed = 0
+        cpu_seconds = 0.0
+        for _ in workers:
+            logins, cpu = results.get()
+            completed += logins
+            cpu_seconds += cpu
+        for worker in workers:
+            worker.join()
+        return completed / options['duration'], cpu_seconds * 1000 / max(completed, 1)
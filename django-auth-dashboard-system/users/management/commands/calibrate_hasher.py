@@ -0,0 +1,48 @@
+import time
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, get_hasher
+from django.core.management.base import BaseCommand
+
+
+def time_hash(hasher, iterations, samples):
+    salt = hasher.salt()
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.encode('calibration-password', salt, iterations)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    help = 'Find the PBKDF2 iteration count that makes one password hash take the target time on this host'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target-ms', type=float, default=250.0)
+        parser.add_argument('--samples', type=int, default=5)
+        parser.add_argument('--probe-iterations', type=int, default=100000)
+
+    def handle(self, *args, **options):
+        hasher = get_hasher('default')
+        if not isinstance(hasher, PBKDF2PasswordHasher):
+            self.stderr.write(self.style.ERROR(f'The default hasher {hasher.algorithm} is not PBKDF2 based'))
+            return
+
+        current = time_hash(hasher, hasher.iterations, options['samples'])
+        target = options['target_ms'] / 1000
+        iterations = options['probe_iterations']
+        for _ in range(3):
+            measured = time_hash(hasher, iterations, options['samples'])
+            iterations = max(1000, round(iterations * target / measured / 1000) * 1000)
+        measured = time_hash(hasher, iterations, options['samples'])
+
+        self.stdout.write(self.style.SUCCESS('=== Password Hasher Calibration ==='))
+        self.stdout.write(f'Current: {hasher.iterations} iterations, {current * 1000:.1f} ms per hash')
+        self.stdout.write(f'Target:  {options["target_ms"]:.0f} ms per hash')
+        self.stdout.write(f'Result:  {iterations} iterations, {measured * 1000:.1f} ms per hash')
+        if iterations < PBKDF2PasswordHasher.iterations:
+            self.stdout.write(self.style.WARNING(
+                f'This is below Django\'s default of {PBKDF2PasswordHasher.iterations} iterations; '
+                f'only lower it if login latency on this host requires it'
+            ))
+        self.stdout.write(f'Add to settings: PASSWORD_HASHER_ITERATIONS = {iterations}')
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def backfill_user_profiles(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    UserProfile = apps.get_model('users', 'UserProfile')
+
+    missing = User.objects.filter(profile__isnull=True).values_list('pk', flat=True)
+    UserProfile.objects.bulk_create(
+        [UserProfile(user_id=user_id) for user_id in list(missing)],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_user_profiles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_backfill_user_profiles'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='thumbnail_source',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+    ]
@@ -1,9 +1,14 @@
-from django.db import models
+from functools import partial
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     profile_picture = models.ImageField(upload_to='profile_pics/', blank=True, null=True)
+    thumbnail_source = models.CharField(max_length=100, blank=True, editable=False)
+    thumbnail_widths = models.JSONField(default=dict, blank=True, editable=False)
     date_of_birth = models.DateField(blank=True, null=True)
     bio = models.TextField(blank=True, null=True)
     skills = models.CharField(max_length=500, blank=True, null=True)
@@ -11,3 +16,18 @@ class UserProfile(models.Model):
     
     def __str__(self):
         return f"{self.user.username}'s Profile"
+
+@receiver(post_save, sender=User)
+def create_user_profile(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        UserProfile.objects.create(user=instance)
+
+@receiver(post_save, sender=UserProfile)
+def schedule_thumbnails(sender, instance, raw=False, update_fields=None, **kwargs):
+    picture = instance.profile_picture
+    if raw or not picture or picture.name == instance.thumbnail_source:
+        return
+    if update_fields is not None and 'profile_picture' not in update_fields:
+        return
+    from .thumbnails import thumbnail_pool
+    transaction.on_commit(partial(thumbnail_pool.submit, instance.pk, picture.name))
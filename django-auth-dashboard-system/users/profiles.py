@@ -0,0 +1,11 @@
+from .models import UserProfile
+
+
+def get_profile(request):
+    if not hasattr(request, '_cached_profile'):
+        try:
+            profile = request.user.profile
+        except UserProfile.DoesNotExist:
+            profile, _ = UserProfile.objects.get_or_create(user=request.user)
+        request._cached_profile = profile
+    return request._cached_profile
@@ -55,12 +55,16 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     };
     
-    const updateAvatar = (base64Image) => {
+    const updateAvatar = (imageUrl) => {
         if (elements.currentAvatar.tagName === 'IMG') {
-            elements.currentAvatar.src = base64Image;
+            // Drop the server thumbnails so the browser shows the local crop
+            elements.currentAvatar.removeAttribute('srcset');
+            elements.currentAvatar.removeAttribute('sizes');
+            elements.currentAvatar.closest('picture')?.querySelectorAll('source').forEach(source => source.remove());
+            elements.currentAvatar.src = imageUrl;
         } else {
             const img = document.createElement('img');
-            img.src = base64Image;
+            img.src = imageUrl;
             img.className = 'avatar-preview';
             img.id = 'currentAvatar';
             elements.currentAvatar.parentNode.replaceChild(img, elements.currentAvatar);
@@ -68,6 +72,32 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     };
     
+    // Send the crop as a binary multipart file; fall back to a base64 field
+    // on browsers that cannot assign files to an input
+    const attachCroppedImage = (blob) => {
+        const fileInput = document.getElementById('croppedAvatar');
+        const hiddenInput = document.getElementById('croppedImage');
+        
+        try {
+            const transfer = new DataTransfer();
+            transfer.items.add(new File([blob], 'avatar.jpg', { type: blob.type }));
+            fileInput.files = transfer.files;
+            hiddenInput.value = '';
+            return Promise.resolve();
+        } catch (e) {
+            fileInput.value = '';
+            return new Promise((resolve, reject) => {
+                const reader = new FileReader();
+                reader.onload = () => {
+                    hiddenInput.value = reader.result;
+                    resolve();
+                };
+                reader.onerror = reject;
+                reader.readAsDataURL(blob);
+            });
+        }
+    };
+    
     // Modal event listeners
     elements.modalElement.addEventListener('show.bs.modal', function() {
         document.body.classList.add('cropper-active');
@@ -150,15 +180,16 @@ document.addEventListener('DOMContentLoaded', function() {
         elements.cropButton.disabled = true;
         
         croppieInstance.result({
-            type: 'base64',
+            type: 'blob',
             size: 'viewport',
-            format: 'png',
-            quality: 1,
+            format: 'jpeg',
+            quality: 0.9,
             circle: false
-        }).then(function(base64) {
-            document.getElementById('croppedImage').value = base64;
-            updateAvatar(base64);
-            elements.cropperModal.hide();
+        }).then(function(blob) {
+            return attachCroppedImage(blob).then(function() {
+                updateAvatar(URL.createObjectURL(blob));
+                elements.cropperModal.hide();
+            });
         }).catch(function(error) {
             console.error('Crop failed:', error);
             alert('Failed to crop image. Please try again.');
@@ -0,0 +1,10 @@
+from django import template
+from users.thumbnails import picture_sources
+
+register = template.Library()
+
+@register.inclusion_tag('users/includes/avatar.html')
+def avatar(profile, size, css_class='', alt='Profile', img_id=''):
+    return {
+        'sources': picture_sources(profile, size), 'size': size, 'css_class': css_class, 'alt': alt, 'img_id': img_id,
+    }
@@ -1,3 +1,257 @@
-from django.test import TestCase
+import base64
+import shutil
+import tempfile
+from importlib import import_module
+from io import BytesIO
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, authenticate
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from .avatars import decode_data_url
+from .backends import SESSION_BACKEND, ProfileModelBackend
+from .forms import UserProfileForm
+from .hashers import CalibratedPBKDF2PasswordHasher
+from .models import UserProfile
+from .profiles import get_profile
+from .thumbnails import THUMBNAIL_SIZES, picture_sources, thumbnail_name
+
+
+class UserProfileTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+
+    def test_profile_created_by_signal(self):
+        self.assertTrue(UserProfile.objects.filter(user=self.user).exists())
+        self.assertEqual(str(self.user.profile), "testuser's Profile")
+
+    def test_backfill_creates_missing_profiles(self):
+        UserProfile.objects.filter(user=self.user).delete()
+        migration = import_module('users.migrations.0002_backfill_user_profiles')
+        migration.backfill_user_profiles(apps, SimpleNamespace(connection=connection))
+        self.assertEqual(UserProfile.objects.filter(user=self.user).count(), 1)
+        migration.backfill_user_profiles(apps, SimpleNamespace(connection=connection))
+        self.assertEqual(UserProfile.objects.filter(user=self.user).count(), 1)
+
+    def test_get_profile_uses_joined_user(self):
+        request = RequestFactory().get('/')
+        request.user = ProfileModelBackend().get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            profile = get_profile(request)
+            self.assertIs(get_profile(request), profile)
+        self.assertEqual(profile.user_id, self.user.pk)
+
+    def test_get_profile_creates_missing_profile(self):
+        UserProfile.objects.filter(user=self.user).delete()
+        request = RequestFactory().get('/')
+        request.user = User.objects.get(pk=self.user.pk)
+        self.assertEqual(get_profile(request).user_id, self.user.pk)
+        self.assertTrue(UserProfile.objects.filter(user=self.user).exists())
+
+
+class DashboardViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+
+    def test_dashboard_loads_profile_with_user(self):
+        self.client.force_login(self.user)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['profile'], self.user.profile)
+
+    def test_sessions_from_model_backend_still_resolve(self):
+        self.client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+        self.assertEqual(
+            self.client.session[BACKEND_SESSION_KEY], 'django.contrib.auth.backends.ModelBackend'
+        )
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(PASSWORD_HASHER_ITERATIONS=1000)
+class LoginViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+
+    def test_hasher_uses_configured_iterations(self):
+        algorithm, iterations = self.user.password.split('$')[:2]
+        self.assertEqual((algorithm, iterations), ('pbkdf2_sha256', '1000'))
+
+    def test_login_hashes_password_once(self):
+        encode = CalibratedPBKDF2PasswordHasher.encode
+        with mock.patch.object(CalibratedPBKDF2PasswordHasher, 'encode', autospec=True, side_effect=encode) as hashed:
+            response = self.client.post(reverse('login'), {'username': 'testuser', 'password': 'testpass123'})
+        self.assertRedirects(response, reverse('dashboard'))
+        self.assertEqual(hashed.call_count, 1)
+        self.assertEqual(int(self.client.session['_auth_user_id']), self.user.pk)
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY], SESSION_BACKEND)
+
+    def test_failed_login_hashes_password_once(self):
+        encode = CalibratedPBKDF2PasswordHasher.encode
+        with mock.patch.object(CalibratedPBKDF2PasswordHasher, 'encode', autospec=True, side_effect=encode) as hashed:
+            response = self.client.post(reverse('login'), {'username': 'testuser', 'password': 'wrong'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(hashed.call_count, 1)
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_unknown_user_hashes_password_once(self):
+        with mock.patch.object(User, 'set_password', autospec=True, side_effect=User.set_password) as hashed:
+            response = self.client.post(reverse('login'), {'username': 'nobody', 'password': 'wrong'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(hashed.call_count, 1)
+
+    def test_signup_logs_in_through_session_backend(self):
+        response = self.client.post(reverse('signup'), {
+            'username': 'newuser', 'email': 'new@example.com',
+            'password1': 'Newpass-123', 'password2': 'Newpass-123',
+        })
+        self.assertRedirects(response, reverse('dashboard'))
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY], SESSION_BACKEND)
+
+    @override_settings(AUTHENTICATION_BACKENDS=[*settings.AUTHENTICATION_BACKENDS, 'users.tests.TokenBackend'])
+    def test_later_backends_still_authenticate(self):
+        self.assertEqual(authenticate(username='testuser', password='token'), self.user)
+        self.assertIsNone(authenticate(username='testuser', password='wrong'))
+
+
+class TokenBackend(ModelBackend):
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if password == 'token':
+            return User.objects.get(username=username)
+
+
+def png_bytes(size=(64, 48)):
+    buffer = BytesIO()
+    Image.new('RGBA', size, (255, 0, 0, 128)).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def data_url(content):
+    return 'data:image/png;base64,' + base64.b64encode(content).decode()
+
+
+class AvatarUploadTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+
+    def clean_profile(self, data=None, files=None):
+        form = UserProfileForm(data or {}, files or {}, instance=self.user.profile, user=self.user)
+        form.is_valid()
+        return form
+
+    def test_decode_data_url(self):
+        content = png_bytes()
+        with decode_data_url(data_url(content)) as source:
+            self.assertEqual(source.read(), content)
+
+    def test_decode_data_url_rejects_oversize(self):
+        with self.assertRaises(ValidationError) as raised:
+            decode_data_url(data_url(b'x' * 4096), limit=1024)
+        self.assertEqual(raised.exception.code, 'too_large')
+
+    def test_decode_data_url_rejects_invalid_base64(self):
+        for value in ('data:image/png;base64,abc*', 'data:image/png;base64,abcde', 'data:text/plain;base64,YWJj'):
+            with self.assertRaises(ValidationError) as raised:
+                decode_data_url(value)
+            self.assertEqual(raised.exception.code, 'invalid')
+
+    def test_body_cap_covers_encoded_avatar(self):
+        self.assertGreater(settings.DATA_UPLOAD_MAX_MEMORY_SIZE, len(data_url(b'x' * settings.AVATAR_MAX_UPLOAD_SIZE)))
+
+    def test_cropped_upload_is_reencoded(self):
+        upload = SimpleUploadedFile('avatar.png', png_bytes((1024, 768)), content_type='image/png')
+        form = self.clean_profile(files={'cropped_avatar': upload})
+        self.assertTrue(form.is_valid(), form.errors)
+        picture = form.cleaned_data['profile_picture']
+        self.assertEqual(picture.name, f'avatar_{self.user.pk}.jpg')
+        with Image.open(picture) as image:
+            self.assertEqual((image.format, image.size), ('JPEG', (512, 384)))
+
+    def test_form_rejects_bad_images(self):
+        form = self.clean_profile(files={'cropped_avatar': SimpleUploadedFile('avatar.png', b'not an image')})
+        self.assertEqual(form.errors['profile_picture'], ['Upload a valid image.'])
+        form = self.clean_profile(data={'cropped_image': data_url(b'not an image')})
+        self.assertEqual(form.errors['profile_picture'], ['Upload a valid image.'])
+        form = self.clean_profile(data={'cropped_image': 'data:image/png;base64,%%%'})
+        self.assertEqual(form.errors['profile_picture'], ['Image data is not valid base64.'])
+
+    @override_settings(AVATAR_MAX_UPLOAD_SIZE=1024)
+    def test_form_rejects_oversize_images(self):
+        content = png_bytes((256, 256)) + b'\0' * 2048
+        form = self.clean_profile(files={'cropped_avatar': SimpleUploadedFile('avatar.png', content)})
+        self.assertEqual(form.errors['profile_picture'], ['Image is too large (maximum 1.0\xa0KB).'])
+        form = self.clean_profile(data={'cropped_image': data_url(content)})
+        self.assertEqual(form.errors['profile_picture'], ['Image is too large (maximum 1.0\xa0KB).'])
+
+    @override_settings(AVATAR_MAX_PIXELS=1000)
+    def test_form_rejects_decompression_bombs(self):
+        form = self.clean_profile(files={'cropped_avatar': SimpleUploadedFile('avatar.png', png_bytes())})
+        self.assertEqual(form.errors['profile_picture'], ['Image dimensions are too large.'])
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, THUMBNAIL_WORKERS=0)
+class ThumbnailTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.profile = self.user.profile
+
+    def test_picture_change_schedules_thumbnails(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.profile.profile_picture.save('avatar.png', ContentFile(png_bytes((640, 480))))
+        self.assertEqual(len(callbacks), 1)
+        self.profile.refresh_from_db()
+        name = self.profile.profile_picture.name
+        self.assertEqual(self.profile.thumbnail_source, name)
+        self.assertEqual(self.profile.thumbnail_widths, {'512': 512, '128': 128, '48': 48})
+        for size in THUMBNAIL_SIZES:
+            for extension in ('jpg', 'webp'):
+                self.assertTrue(default_storage.exists(thumbnail_name(name, size, extension)))
+        self.assertEqual(picture_sources(self.profile, 100)['src'], f'/media/{thumbnail_name(name, 128, "jpg")}')
+
+    def test_edit_page_previews_thumbnail(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.profile_picture.save('avatar.png', ContentFile(png_bytes((640, 480))))
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('edit_profile'))
+        name = self.user.profile.profile_picture.name
+        self.assertContains(response, f'src="/media/{thumbnail_name(name, 128, "jpg")}"')
+        self.assertContains(response, 'id="currentAvatar"')
+        self.assertNotContains(response, f'src="/media/{name}"')
+
+    def test_unrelated_saves_do_not_schedule(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.profile_picture.save('avatar.png', ContentFile(png_bytes()))
+        self.profile.refresh_from_db()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.profile.bio = 'Updated'
+            self.profile.save()
+            self.profile.save(update_fields=['bio'])
+        self.assertEqual(callbacks, [])
+
+    def test_pending_picture_serves_original(self):
+        self.profile.profile_picture = 'profile_pics/pending.png'
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.profile.save(update_fields=['profile_picture'])
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(picture_sources(self.profile, 100), {'src': '/media/profile_pics/pending.png'})
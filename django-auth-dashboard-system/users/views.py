@@ -1,11 +1,10 @@
 from django.shortcuts import render, redirect
-from django.contrib.auth import login, logout, authenticate, update_session_auth_hash
+from django.contrib.auth import login, logout, update_session_auth_hash
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from .forms import SignUpForm, LoginForm, UserProfileForm, CustomPasswordChangeForm
-from .models import UserProfile
-import base64
-from django.core.files.base import ContentFile
+from .backends import SESSION_BACKEND
+from .profiles import get_profile
 
 def signup_view(request):
     if request.user.is_authenticated:
@@ -15,8 +14,7 @@ def signup_view(request):
         form = SignUpForm(request.POST)
         if form.is_valid():
             user = form.save()
-            UserProfile.objects.create(user=user)
-            login(request, user)
+            login(request, user, backend=SESSION_BACKEND)
             messages.success(request, 'Account created successfully!')
             return redirect('dashboard')
         else:
@@ -33,13 +31,10 @@ def login_view(request):
     if request.method == 'POST':
         form = LoginForm(request, data=request.POST)
         if form.is_valid():
-            username = form.cleaned_data.get('username')
-            password = form.cleaned_data.get('password')
-            user = authenticate(username=username, password=password)
-            if user is not None:
-                login(request, user)
-                messages.success(request, f'Welcome back, {username}!')
-                return redirect('dashboard')
+            user = form.get_user()
+            login(request, user, backend=SESSION_BACKEND)
+            messages.success(request, f'Welcome back, {user.get_username()}!')
+            return redirect('dashboard')
         else:
             messages.error(request, 'Invalid username or password.')
     else:
@@ -54,12 +49,11 @@ def logout_view(request):
 
 @login_required
 def dashboard_view(request):
-    profile, created = UserProfile.objects.get_or_create(user=request.user)
-    return render(request, 'users/dashboard.html', {'profile': profile})
+    return render(request, 'users/dashboard.html', {'profile': get_profile(request)})
 
 @login_required
 def edit_profile_view(request):
-    profile, created = UserProfile.objects.get_or_create(user=request.user)
+    profile = get_profile(request)
     
     if request.method == 'POST':
         form = UserProfileForm(request.POST, request.FILES, instance=profile, user=request.user)
@@ -69,16 +63,7 @@ def edit_profile_view(request):
             request.user.last_name = form.cleaned_data.get('last_name', '')
             request.user.save()
             
-            profile = form.save(commit=False)
-            
-            cropped_image = request.POST.get('cropped_image')
-            if cropped_image:
-                format, imgstr = cropped_image.split(';base64,')
-                ext = format.split('/')[-1]
-                data = ContentFile(base64.b64decode(imgstr), name=f'avatar_{request.user.id}.{ext}')
-                profile.profile_picture = data
-            
-            profile.save()
+            form.save()
             messages.success(request, 'Profile updated successfully!')
             return redirect('dashboard')
     else:
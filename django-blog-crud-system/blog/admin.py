@@ -1,15 +1,78 @@
+from collections import Counter
+
 from django.contrib import admin
-from .models import Post, UserProfile
+from .models import Post, PostMonthlyStats, Tag, UserProfile, recent_post_count_expression
+from .sitemaps import month_bounds, parse_section, year_bounds
+
+class MonthListFilter(admin.SimpleListFilter):
+    title = 'month'
+    parameter_name = 'month'
+    
+    def lookups(self, request, model_admin):
+        author = request.GET.get('author__id__exact')
+        months = PostMonthlyStats.objects.months(author if author and author.isdigit() else None)
+        rows = list(months.values_list('month', 'post_count'))
+        years = Counter()
+        for month, post_count in rows:
+            years[month.year] += post_count
+        selected_year = (self.value() or '')[:4]
+        choices = []
+        for year in sorted(years, reverse=True):
+            choices.append((str(year), f'{year} ({years[year]})'))
+            if str(year) == selected_year:
+                choices.extend(
+                    (f'{month:%Y-%m}', f'{month:%B %Y} ({post_count})')
+                    for month, post_count in rows if month.year == year
+                )
+        return choices
+    
+    def queryset(self, request, queryset):
+        value = self.value()
+        if not value:
+            return queryset
+        month = parse_section(value)
+        try:
+            if month is not None:
+                start, end = month_bounds(*month)
+            elif value.isdigit() and len(value) == 4:
+                start, end = year_bounds(int(value))
+            else:
+                return queryset.none()
+        except ValueError:
+            return queryset.none()
+        return queryset.filter(created_at__gte=start, created_at__lt=end)
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ('title', 'author', 'created_at', 'updated_at')
-    list_filter = ('created_at', 'author')
+    list_display = ('title', 'author', 'created_at', 'updated_at', 'view_count')
+    list_select_related = ('author',)
+    list_filter = (MonthListFilter, 'author')
     search_fields = ('title', 'content')
-    date_hierarchy = 'created_at'
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at', 'view_count')
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
-    list_display = ('user', 'created_at', 'total_posts')
+    list_display = ('user', 'created_at', 'post_count', 'posts_this_week', 'last_post_at')
+    list_select_related = ('user',)
     search_fields = ('user__username', 'bio')
+    readonly_fields = ('post_count', 'last_post_at')
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(recent_post_count=recent_post_count_expression())
+    
+    @admin.display(description='Posts this week', ordering='recent_post_count')
+    def posts_this_week(self, obj):
+        return obj.recent_post_count
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug', 'post_count')
+    search_fields = ('name', 'slug')
+    prepopulated_fields = {'slug': ('name',)}
+    readonly_fields = ('post_count',)
+
+@admin.register(PostMonthlyStats)
+class PostMonthlyStatsAdmin(admin.ModelAdmin):
+    list_display = ('month', 'author', 'post_count')
+    list_select_related = ('author',)
+    readonly_fields = ('author', 'month', 'post_count')
@@ -0,0 +1,4 @@
+from .urls import build_urlpatterns
+from . import async_views
+
+urlpatterns = build_urlpatterns(async_views)
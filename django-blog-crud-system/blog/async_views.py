@@ -0,0 +1,77 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.http import Http404
+from django.shortcuts import render
+from .cache import GLOBAL_GENERATION, RELATED_GENERATION, author_generation, cache_public_page, post_generation
+from .conditional import condition, listing_etag, listing_last_modified, post_etag, post_last_modified
+from .models import Post, Tag
+from .views import SORT_ORDERINGS, home_listing, post_paginator
+from .view_counts import count_post_view
+from .related import related_links
+from .replicas import replica_reads
+
+
+async def resolve_user(request):
+    return await sync_to_async(lambda: request.user.is_authenticated)()
+
+
+@replica_reads
+@condition(etag_func=listing_etag, last_modified_func=listing_last_modified)
+@cache_public_page('home', lambda: [GLOBAL_GENERATION])
+async def home(request):
+    await resolve_user(request)
+    posts, search_query, sort_by = home_listing(request)
+    paginator = post_paginator(posts, SORT_ORDERINGS[sort_by])
+    page_obj = await paginator.aget_page(request.GET.get('page'), with_count=True)
+    
+    context = {
+        'page_obj': page_obj,
+        'search_query': search_query,
+        'sort_by': sort_by,
+        'tag_cloud': [tag async for tag in Tag.objects.popular()],
+        'tag_facets': [tag async for tag in Tag.objects.matching(search_query)] if search_query else [],
+    }
+    
+    return render(request, 'blog/home.html', context)
+
+
+@replica_reads
+@count_post_view
+@condition(etag_func=post_etag, last_modified_func=post_last_modified)
+@cache_public_page('post_detail', lambda pk: [RELATED_GENERATION, post_generation(pk)])
+async def post_detail(request, pk):
+    try:
+        post, _ = await asyncio.gather(
+            Post.objects.select_related('author').prefetch_related('tags').aget(pk=pk),
+            resolve_user(request),
+        )
+    except Post.DoesNotExist:
+        raise Http404('No Post matches the given query.')
+    related = [link.related async for link in related_links(post)]
+    return render(request, 'blog/post_detail.html', {'post': post, 'related_posts': related})
+
+
+@replica_reads
+@condition(etag_func=listing_etag, last_modified_func=listing_last_modified)
+@cache_public_page('author_posts', lambda username: [author_generation(username)])
+async def author_posts(request, username):
+    posts = Post.objects.filter(author__username=username).cards()
+    paginator = post_paginator(posts)
+    try:
+        author, page_obj, _ = await asyncio.gather(
+            User.objects.select_related('profile').aget(username=username),
+            paginator.aget_page(request.GET.get('page')),
+            resolve_user(request),
+        )
+    except User.DoesNotExist:
+        raise Http404('No User matches the given query.')
+    
+    context = {
+        'author': author,
+        'page_obj': page_obj,
+        'total_posts': author.profile.total_posts,
+    }
+    
+    return render(request, 'blog/author_posts.html', context)
@@ -0,0 +1,104 @@
+import json
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+
+GATED_LATENCIES = ('p50_ms', 'p95_ms')
+
+
+@contextmanager
+def seeded_test_database(posts, authors, seed=0, test_name=None, options=None):
+    from .sample_data import SampleDataGenerator
+    settings_dict = connection.settings_dict
+    original = {key: settings_dict[key] for key in ('TEST', 'OPTIONS')}
+    if test_name is not None:
+        settings_dict['TEST'] = {**settings_dict['TEST'], 'NAME': test_name}
+    if options is not None:
+        settings_dict['OPTIONS'] = options
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        SampleDataGenerator(seed=seed).generate(posts, authors=authors, batch_size=1000)
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+        settings_dict.update(original)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(timings):
+    return {
+        'p50_ms': round(percentile(timings, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(timings, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(timings, 0.99) * 1000, 3),
+        'mean_ms': round(statistics.fmean(timings) * 1000, 3) if timings else 0.0,
+    }
+
+
+def measure_endpoint(request_func, iterations=50, warmup=5):
+    for _ in range(warmup):
+        request_func()
+
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = request_func()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            response = request_func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    result = summarize(timings)
+    result.update({
+        'status': response.status_code,
+        'queries': len(queries),
+        'peak_kb': round(peak / 1024, 1),
+    })
+    return result
+
+
+def compare_to_baseline(results, baseline, latency_tolerance=0.5, memory_tolerance=0.25, noise_floor_ms=5.0):
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result['status'] != expected['status']:
+            regressions.append(f"{name}: status {result['status']} (baseline {expected['status']})")
+        if result['queries'] > expected['queries']:
+            regressions.append(f"{name}: {result['queries']} queries (baseline {expected['queries']})")
+        for metric in GATED_LATENCIES:
+            limit = expected[metric] * (1 + latency_tolerance)
+            if result[metric] > limit and result[metric] - expected[metric] > noise_floor_ms:
+                regressions.append(f'{name}: {metric} {result[metric]} (baseline {expected[metric]})')
+        if result['peak_kb'] > expected['peak_kb'] * (1 + memory_tolerance):
+            regressions.append(f"{name}: peak {result['peak_kb']}KB (baseline {expected['peak_kb']}KB)")
+    return regressions
+
+
+def load_baseline(path):
+    with open(path) as baseline_file:
+        return json.load(baseline_file)['endpoints']
+
+
+def save_baseline(path, results, meta):
+    with open(path, 'w') as baseline_file:
+        json.dump({'meta': meta, 'endpoints': results}, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write('\n')
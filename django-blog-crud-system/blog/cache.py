@@ -0,0 +1,187 @@
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.http import urlencode
+from .replicas import primary_reads
+
+CACHE_PREFIX = 'blog:page'
+CACHEABLE_PARAMS = ('search', 'sort', 'page')
+FEED_PARAMS = ('p',)
+GLOBAL_GENERATION = 'blog:gen:global'
+RELATED_GENERATION = 'blog:gen:related'
+CACHED_VIEWS = ('home', 'post_detail', 'author_posts', 'tag_posts', 'archive_month')
+CACHED_FEEDS = ('feed_rss', 'feed_atom', 'author_feed_rss', 'author_feed_atom', 'sitemap_index', 'sitemap_section')
+
+
+def page_cache_enabled():
+    return getattr(settings, 'BLOG_PAGE_CACHE_ENABLED', False)
+
+
+def get_page_cache():
+    return caches[getattr(settings, 'BLOG_PAGE_CACHE_ALIAS', 'default')]
+
+
+def author_generation(username):
+    return f'blog:gen:author:{username}'
+
+
+def post_generation(pk):
+    return f'blog:gen:post:{pk}'
+
+
+def month_section(value):
+    value = timezone.localtime(value) if timezone.is_aware(value) else value
+    return f'{value.year:04d}-{value.month:02d}'
+
+
+def month_generation(section):
+    return f'blog:gen:month:{section}'
+
+
+def get_generations(cache, keys):
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, time.time_ns(), timeout=None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def bump_generations(keys):
+    cache = get_page_cache()
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def normalized_params(request, allowed=CACHEABLE_PARAMS):
+    if set(request.GET) - set(allowed):
+        return None
+    params = []
+    for name in allowed:
+        value = request.GET.get(name, '')
+        if value:
+            params.append((name, value))
+    return urlencode(params)
+
+
+def record_stat(cache, view_name, outcome):
+    key = f'blog:stats:{view_name}:{outcome}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def get_stats(view_names):
+    cache = get_page_cache()
+    stats = {}
+    for view_name in view_names:
+        hits = cache.get(f'blog:stats:{view_name}:hit', 0)
+        misses = cache.get(f'blog:stats:{view_name}:miss', 0)
+        stats[view_name] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / (hits + misses) if hits + misses else 0.0,
+        }
+    return stats
+
+
+def reset_stats(view_names):
+    get_page_cache().delete_many([
+        f'blog:stats:{view_name}:{outcome}' for view_name in view_names for outcome in ('hit', 'miss')
+    ])
+
+
+def is_cacheable_request(request):
+    return (
+        page_cache_enabled()
+        and request.method == 'GET'
+        and not request.user.is_authenticated
+        and not len(get_messages(request))
+    )
+
+
+def cache_response(view_name, generation_keys, should_cache, allowed_params, timeout_setting, default_timeout):
+    def lookup(request, args, kwargs):
+        params = normalized_params(request, allowed_params)
+        if params is None or not should_cache(request):
+            return None, None, None
+
+        cache = get_page_cache()
+        keys = generation_keys(**kwargs)
+        generations = '.'.join(str(generation) for generation in get_generations(cache, keys))
+        args_key = ':'.join(str(value) for value in [*args, *kwargs.values()])
+        digest = hashlib.md5(f'{args_key}?{params}'.encode()).hexdigest()
+        cache_key = f'{CACHE_PREFIX}:{view_name}:{generations}:{digest}'
+
+        cached = cache.get(cache_key)
+        if cached is None:
+            record_stat(cache, view_name, 'miss')
+            return cache, cache_key, None
+        record_stat(cache, view_name, 'hit')
+        content, content_type = cached
+        response = HttpResponse(content, content_type=content_type)
+        response['X-Blog-Cache'] = 'hit'
+        return cache, cache_key, response
+
+    def store(cache, cache_key, response):
+        if hasattr(response, 'render') and callable(response.render):
+            response = response.render()
+        if response.status_code == 200 and not response.streaming and not response.cookies:
+            timeout = getattr(settings, timeout_setting, default_timeout)
+            cache.set(cache_key, (response.content, response['Content-Type']), timeout)
+            response['X-Blog-Cache'] = 'miss'
+        return response
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                cache, cache_key, response = await sync_to_async(lookup)(request, args, kwargs)
+                if response is not None:
+                    return response
+                if cache is None:
+                    return await view_func(request, *args, **kwargs)
+                with primary_reads():
+                    response = await view_func(request, *args, **kwargs)
+                    return await sync_to_async(store)(cache, cache_key, response)
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            cache, cache_key, response = lookup(request, args, kwargs)
+            if response is not None:
+                return response
+            if cache is None:
+                return view_func(request, *args, **kwargs)
+            with primary_reads():
+                return store(cache, cache_key, view_func(request, *args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def cache_public_page(view_name, generation_keys):
+    return cache_response(
+        view_name, generation_keys, is_cacheable_request, CACHEABLE_PARAMS, 'BLOG_PAGE_CACHE_TIMEOUT', 300,
+    )
+
+
+def is_feed_request(request):
+    return request.method == 'GET'
+
+
+def cache_feed(view_name, generation_keys):
+    return cache_response(
+        view_name, generation_keys, is_feed_request, FEED_PARAMS, 'BLOG_FEED_CACHE_TIMEOUT', None,
+    )
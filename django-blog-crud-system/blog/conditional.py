@@ -0,0 +1,92 @@
+import hashlib
+from datetime import timezone as dt_timezone
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators import http
+from .models import Post, RelatedPost
+
+
+def validator_digest(request, *parts):
+    raw = ':'.join(str(part) for part in (*parts, request.user.pk, request.GET.urlencode()))
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def listing_probe(request, username=None):
+    if not hasattr(request, '_blog_listing_probe'):
+        posts = Post.objects.all()
+        if username is not None:
+            posts = posts.filter(author__username=username)
+        request._blog_listing_probe = posts.aggregate(latest=Max('updated_at'), total=Count('id'))
+    return request._blog_listing_probe
+
+
+def listing_last_modified(request, username=None):
+    return listing_probe(request, username)['latest']
+
+
+def listing_etag(request, username=None):
+    probe = listing_probe(request, username)
+    return validator_digest(request, 'listing', username, probe['latest'], probe['total'])
+
+
+def post_probe(request, pk):
+    if not hasattr(request, '_blog_post_probe'):
+        # Rewriting a post's related links always deletes rows or inserts new ids, so count
+        # and max id change whenever the related panel does.
+        links = RelatedPost.objects.filter(post=OuterRef('pk')).order_by().values('post')
+        request._blog_post_probe = Post.objects.filter(pk=pk).annotate(
+            related_count=Subquery(links.annotate(total=Count('id')).values('total')),
+            related_latest=Subquery(links.annotate(latest=Max('id')).values('latest')),
+        ).values('updated_at', 'content_html_key', 'related_count', 'related_latest').first()
+    return request._blog_post_probe
+
+
+def post_last_modified(request, pk):
+    probe = post_probe(request, pk)
+    return probe and probe['updated_at']
+
+
+def post_etag(request, pk):
+    probe = post_probe(request, pk)
+    if probe is None:
+        return None
+    return validator_digest(
+        request, 'post', pk, probe['updated_at'].isoformat(), probe['content_html_key'],
+        probe['related_count'], probe['related_latest'],
+    )
+
+
+def condition(etag_func=None, last_modified_func=None):
+    def validators(request, *args, **kwargs):
+        etag = etag_func(request, *args, **kwargs) if etag_func else None
+        last_modified = last_modified_func(request, *args, **kwargs) if last_modified_func else None
+        if last_modified and not timezone.is_aware(last_modified):
+            last_modified = timezone.make_aware(last_modified, dt_timezone.utc)
+        return (
+            quote_etag(etag) if etag is not None else None,
+            int(last_modified.timestamp()) if last_modified else None,
+        )
+
+    def decorator(view_func):
+        if not iscoroutinefunction(view_func):
+            return http.condition(etag_func=etag_func, last_modified_func=last_modified_func)(view_func)
+
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            etag, last_modified = await sync_to_async(validators)(request, *args, **kwargs)
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = await view_func(request, *args, **kwargs)
+            if request.method in ('GET', 'HEAD'):
+                if last_modified and not response.has_header('Last-Modified'):
+                    response.headers['Last-Modified'] = http_date(last_modified)
+                if etag:
+                    response.headers.setdefault('ETag', etag)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,93 @@
+import json
+from datetime import datetime, time
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from .models import Post
+from .pagination import CursorPaginator, InvalidCursor
+
+EXPORT_FIELDS = ('id', 'title', 'content', 'author__username', 'created_at', 'updated_at')
+EXPORT_ORDERING = ('updated_at', 'id')
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+
+class ExportError(ValueError):
+    pass
+
+
+def parse_day(value, name, end_of_day=False):
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ExportError(f'Invalid {name} date: {value}')
+    moment = datetime.combine(day, time.max if end_of_day else time.min)
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+
+def export_queryset(author=None, start=None, end=None, since=None):
+    posts = Post.objects.all()
+    if author:
+        if not User.objects.filter(username=author).exists():
+            raise ExportError(f'Unknown author: {author}')
+        posts = posts.filter(author__username=author)
+    if start:
+        posts = posts.filter(created_at__gte=parse_day(start, 'start'))
+    if end:
+        posts = posts.filter(created_at__lte=parse_day(end, 'end', end_of_day=True))
+
+    paginator = CursorPaginator(posts, 1, ordering=EXPORT_ORDERING)
+    if not since:
+        return posts.order_by(*EXPORT_ORDERING), paginator
+    try:
+        timestamp = parse_datetime(since)
+    except ValueError:
+        raise ExportError(f'Invalid since timestamp: {since}')
+    if timestamp is not None:
+        if timezone.is_naive(timestamp):
+            timestamp = timezone.make_aware(timestamp)
+        return posts.filter(updated_at__gt=timestamp).order_by(*EXPORT_ORDERING), paginator
+    try:
+        return paginator.queryset_after(since), paginator
+    except InvalidCursor:
+        raise ExportError(f'Invalid since cursor: {since}')
+
+
+def serialize_rows(queryset, paginator, chunk_size=2000):
+    for post_id, title, content, author, created_at, updated_at in queryset.values_list(
+        *EXPORT_FIELDS
+    ).iterator(chunk_size=chunk_size):
+        yield {
+            'id': post_id,
+            'title': title,
+            'content': content,
+            'author': author,
+            'created_at': created_at.isoformat(),
+            'updated_at': updated_at.isoformat(),
+            'cursor': paginator.encode_values([updated_at, post_id]),
+        }
+
+
+def iter_ndjson(queryset, paginator, chunk_size=2000):
+    for record in serialize_rows(queryset, paginator, chunk_size):
+        yield json.dumps(record) + '\n'
+
+
+def iter_json(queryset, paginator, chunk_size=2000):
+    yield '{"posts": ['
+    cursor = None
+    for index, record in enumerate(serialize_rows(queryset, paginator, chunk_size)):
+        cursor = record['cursor']
+        yield (',' if index else '') + json.dumps(record)
+    yield '], "next_since": ' + json.dumps(cursor) + '}\n'
+
+
+def iter_export(export_format, queryset, paginator, chunk_size=2000):
+    if export_format == 'json':
+        return iter_json(queryset, paginator, chunk_size)
+    return iter_ndjson(queryset, paginator, chunk_size)
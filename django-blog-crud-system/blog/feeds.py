@@ -0,0 +1,61 @@
+from django.contrib.auth.models import User
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse, reverse_lazy
+from django.utils.feedgenerator import Atom1Feed
+from .models import Post
+
+FEED_ITEMS = 20
+
+
+class LatestPostsFeed(Feed):
+    title = 'BlogSys latest posts'
+    link = reverse_lazy('home')
+    description = 'The newest posts published on BlogSys.'
+
+    def items(self):
+        return Post.objects.cards()[:FEED_ITEMS]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.excerpt
+
+    def item_pubdate(self, item):
+        return item.created_at
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.username
+
+
+class AtomLatestPostsFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class AuthorPostsFeed(LatestPostsFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User.objects.only('id', 'username'), username=username)
+
+    def title(self, obj):
+        return f'Posts by {obj.username} on BlogSys'
+
+    def link(self, obj):
+        return reverse('author_posts', kwargs={'username': obj.username})
+
+    def description(self, obj):
+        return f'The newest posts published by {obj.username}.'
+
+    def items(self, obj):
+        return Post.objects.filter(author=obj).cards()[:FEED_ITEMS]
+
+
+class AtomAuthorPostsFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
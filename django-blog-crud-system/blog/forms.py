@@ -1,7 +1,7 @@
 from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
-from .models import Post
+from .models import MAX_TAGS_PER_POST, Post, parse_tag_names
 
 class UserRegisterForm(UserCreationForm):
     email = forms.EmailField(
@@ -23,6 +23,11 @@ class UserRegisterForm(UserCreationForm):
         fields = ['username', 'email', 'password1', 'password2']
 
 class PostForm(forms.ModelForm):
+    tags = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Comma separated, e.g. django, python'})
+    )
+    
     class Meta:
         model = Post
         fields = ['title', 'content']
@@ -39,6 +44,11 @@ class PostForm(forms.ModelForm):
             }),
         }
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.initial.setdefault('tags', ', '.join(tag.name for tag in self.instance.tags.all()))
+    
     def clean_title(self):
         title = self.cleaned_data.get('title')
         if len(title) < 5:
@@ -50,3 +60,13 @@ class PostForm(forms.ModelForm):
         if len(content) < 20:
             raise forms.ValidationError('Content must be at least 20 characters long.')
         return content
+    
+    def clean_tags(self):
+        tags = self.cleaned_data.get('tags', '')
+        if len(parse_tag_names(tags, limit=MAX_TAGS_PER_POST + 1)) > MAX_TAGS_PER_POST:
+            raise forms.ValidationError(f'Use at most {MAX_TAGS_PER_POST} tags.')
+        return tags
+    
+    def _save_m2m(self):
+        super()._save_m2m()
+        self.instance.set_tags(self.cleaned_data.get('tags', ''))
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from blog.benchmarking import seeded_test_database, summarize
+from blog.models import Post
+
+SCENARIOS = {
+    'wsgi-sync': ('blog.urls', 'wsgi'),
+    'asgi-sync': ('blog.urls', 'asgi'),
+    'asgi-async': ('blog.async_urls', 'asgi'),
+}
+
+
+class Command(BaseCommand):
+    help = 'Compare requests/sec and tail latency of the read endpoints under WSGI sync, ASGI sync and ASGI async'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=5000)
+        parser.add_argument('--authors', type=int, default=100)
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+
+    def handle(self, *args, **options):
+        with seeded_test_database(options['posts'], options['authors']):
+            author = User.objects.get(username='demo')
+            post = Post.objects.filter(author=author).first()
+            if post is None:
+                raise CommandError('The demo author has no posts; increase --posts')
+            results = {}
+            for name in options['scenarios']:
+                urlconf, protocol = SCENARIOS[name]
+                with override_settings(ROOT_URLCONF=urlconf):
+                    paths = self.build_paths(post, author)
+                    runner = self.run_wsgi if protocol == 'wsgi' else self.run_asgi
+                    runner(paths, options['requests'] // 10, options['concurrency'])
+                    results[name] = runner(paths, options['requests'], options['concurrency'])
+                self.stdout.write(f'{name}: done')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'=== Read endpoints, {options["requests"]} requests at concurrency {options["concurrency"]} ==='
+        ))
+        self.stdout.write(f'{"scenario":<12} {"req/s":>9} {"p50":>9} {"p95":>9} {"p99":>9}')
+        for name, (rate, latency) in results.items():
+            self.stdout.write(
+                f'{name:<12} {rate:>9.1f} {latency["p50_ms"]:>7.2f}ms '
+                f'{latency["p95_ms"]:>7.2f}ms {latency["p99_ms"]:>7.2f}ms'
+            )
+
+    def build_paths(self, post, author):
+        return [
+            (reverse('home'), {}),
+            (reverse('home'), {'search': 'django'}),
+            (reverse('home'), {'sort': 'title'}),
+            (reverse('post_detail', kwargs={'pk': post.pk}), {}),
+            (reverse('author_posts', kwargs={'username': author.username}), {}),
+        ]
+
+    def run_wsgi(self, paths, total, concurrency):
+        local = threading.local()
+
+        def request(index):
+            if not hasattr(local, 'client'):
+                local.client = Client()
+            path, params = paths[index % len(paths)]
+            started = time.perf_counter()
+            local.client.get(path, params)
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            timings = list(executor.map(request, range(total)))
+        return total / (time.perf_counter() - started), summarize(timings)
+
+    def run_asgi(self, paths, total, concurrency):
+        async def run():
+            client = AsyncClient()
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def request(index):
+                path, params = paths[index % len(paths)]
+                async with semaphore:
+                    started = time.perf_counter()
+                    await client.get(path, params)
+                    return time.perf_counter() - started
+
+            started = time.perf_counter()
+            timings = await asyncio.gather(*(request(index) for index in range(total)))
+            return total / (time.perf_counter() - started), summarize(timings)
+
+        return asyncio.run(run())
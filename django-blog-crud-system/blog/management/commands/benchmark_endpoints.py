@@ -0,0 +1,103 @@
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from blog.benchmarking import (
+    compare_to_baseline, load_baseline, measure_endpoint, save_baseline, seeded_test_database,
+)
+from blog.models import Post
+
+DEFAULT_BASELINE = Path(__file__).resolve().parents[2] / 'benchmarks' / 'endpoints_baseline.json'
+
+
+def build_endpoints(client, post, author):
+    detail = reverse('post_detail', kwargs={'pk': post.pk})
+    edit = reverse('post_edit', kwargs={'pk': post.pk})
+    form_data = {'title': 'Benchmark post title', 'content': 'Benchmark post content ' * 20}
+    return {
+        'home': lambda: client.get(reverse('home')),
+        'home_search': lambda: client.get(reverse('home'), {'search': 'django cache'}),
+        'home_sort_title': lambda: client.get(reverse('home'), {'sort': 'title'}),
+        'home_sort_oldest': lambda: client.get(reverse('home'), {'sort': 'oldest'}),
+        'post_detail': lambda: client.get(detail),
+        'author_posts': lambda: client.get(reverse('author_posts', kwargs={'username': author.username})),
+        'dashboard': lambda: client.get(reverse('dashboard')),
+        'post_create_form': lambda: client.get(reverse('post_create')),
+        'post_create': lambda: client.post(reverse('post_create'), form_data),
+        'post_edit_form': lambda: client.get(edit),
+        'post_edit': lambda: client.post(edit, form_data),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Benchmark blog endpoints against a seeded test database and compare with a baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=5000)
+        parser.add_argument('--authors', type=int, default=100)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--iterations', type=int, default=100)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--endpoints', nargs='+')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+        parser.add_argument('--save-baseline', action='store_true')
+        parser.add_argument('--latency-tolerance', type=float, default=0.5)
+        parser.add_argument('--memory-tolerance', type=float, default=0.25)
+
+    def handle(self, *args, **options):
+        with seeded_test_database(options['posts'], options['authors'], options['seed']):
+            results = self.run_benchmarks(options)
+
+        self.stdout.write(self.style.SUCCESS('=== Endpoint Benchmarks ==='))
+        self.stdout.write(f'{"endpoint":<18} {"p50":>9} {"p95":>9} {"p99":>9} {"queries":>8} {"peak":>10}')
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<18} {result["p50_ms"]:>7.2f}ms {result["p95_ms"]:>7.2f}ms {result["p99_ms"]:>7.2f}ms '
+                f'{result["queries"]:>8} {result["peak_kb"]:>8.1f}KB'
+            )
+
+        baseline_path = Path(options['baseline'])
+        if options['save_baseline']:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            meta = {key: options[key] for key in ('posts', 'authors', 'seed', 'iterations')}
+            save_baseline(baseline_path, results, meta)
+            self.stdout.write(self.style.SUCCESS(f'Baseline written to {baseline_path}'))
+            return
+
+        if not baseline_path.exists():
+            self.stdout.write(self.style.WARNING(f'No baseline at {baseline_path}, skipping comparison'))
+            return
+
+        regressions = compare_to_baseline(
+            results,
+            load_baseline(baseline_path),
+            latency_tolerance=options['latency_tolerance'],
+            memory_tolerance=options['memory_tolerance'],
+        )
+        if regressions:
+            for regression in regressions:
+                self.stderr.write(self.style.ERROR(regression))
+            raise CommandError(f'{len(regressions)} performance regressions against {baseline_path}')
+        self.stdout.write(self.style.SUCCESS('No regressions against baseline'))
+
+    def run_benchmarks(self, options):
+        author = User.objects.get(username='demo')
+        post = Post.objects.filter(author=author).order_by('-created_at').first()
+        if post is None:
+            raise CommandError('The demo author has no posts; increase --posts')
+
+        client = Client()
+        client.force_login(author)
+        endpoints = build_endpoints(client, post, author)
+        selected = options['endpoints'] or list(endpoints)
+        unknown = set(selected) - set(endpoints)
+        if unknown:
+            raise CommandError(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+
+        results = {}
+        for name in selected:
+            results[name] = measure_endpoint(endpoints[name], options['iterations'], options['warmup'])
+            self.stdout.write(f'{name}: done')
+        return results
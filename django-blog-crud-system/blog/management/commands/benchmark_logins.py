@@ -0,0 +1,117 @@
+import multiprocessing
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.db.models.signals import post_save
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from blog.benchmarking import seeded_test_database
+from blog.models import save_user_profile
+from blog.sample_data import DEMO_PASSWORD
+
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+def legacy_save_user_profile(sender, instance, **kwargs):
+    if hasattr(instance, 'profile'):
+        instance.profile.save()
+
+
+@contextmanager
+def legacy_profile_saves():
+    post_save.disconnect(save_user_profile, sender=User)
+    post_save.connect(legacy_save_user_profile, sender=User)
+    try:
+        yield
+    finally:
+        post_save.disconnect(legacy_save_user_profile, sender=User)
+        post_save.connect(save_user_profile, sender=User)
+
+
+MODES = {
+    'legacy': legacy_profile_saves,
+    'tracked': contextmanager(lambda: (yield)),
+}
+
+
+def run_worker(usernames, duration, results):
+    client = Client()
+    url = reverse('login')
+    completed = locked = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        try:
+            username = usernames[completed % len(usernames)]
+            client.cookies.clear()
+            response = client.post(url, {'username': username, 'password': DEMO_PASSWORD})
+            if response.status_code == 302:
+                completed += 1
+        except OperationalError:
+            locked += 1
+    results.put((completed, locked))
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Measure concurrent logins/sec with the legacy full profile save and with dirty-field tracking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=10.0)
+        parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+
+    def handle(self, *args, **options):
+        if options['users'] < 1:
+            raise CommandError('--users must be at least 1')
+        options['workers'] = max(1, min(options['workers'], options['users']))
+        context = multiprocessing.get_context('fork')
+        summary = {}
+        for mode in options['modes']:
+            with tempfile.TemporaryDirectory() as directory, override_settings(PASSWORD_HASHERS=FAST_HASHERS):
+                test_name = str(Path(directory) / 'logins.sqlite3')
+                with seeded_test_database(
+                    options['users'], options['users'], test_name=test_name, options=settings.SQLITE_OPTIONS
+                ), MODES[mode]():
+                    summary[mode] = self.run_mode(context, options)
+            self.stdout.write(f'{mode}: done')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'=== {options["workers"]} workers, {options["users"]} users, {options["duration"]:.0f}s ==='
+        ))
+        self.stdout.write(f'{"mode":<10} {"logins/s":>9} {"queries":>8} {"writes":>7} {"locked":>8}')
+        for mode, (rate, queries, writes, locked) in summary.items():
+            self.stdout.write(f'{mode:<10} {rate:>9.1f} {queries:>8} {writes:>7} {locked:>8}')
+
+    def run_mode(self, context, options):
+        usernames = list(User.objects.order_by('pk').values_list('username', flat=True))
+        with CaptureQueriesContext(connection) as captured:
+            Client().post(reverse('login'), {'username': usernames[0], 'password': DEMO_PASSWORD})
+        statements = [query['sql'] for query in captured if not query['sql'].startswith(('BEGIN', 'COMMIT'))]
+        writes = sum(sql.startswith(('INSERT', 'UPDATE', 'DELETE')) for sql in statements)
+        connections.close_all()
+
+        results = context.Queue()
+        workers = [
+            context.Process(
+                target=run_worker, args=(usernames[index::options['workers']], options['duration'], results)
+            )
+            for index in range(options['workers'])
+        ]
+        for worker in workers:
+            worker.start()
+        completed = locked = 0
+        for _ in workers:
+            logins, errors = results.get()
+            completed += logins
+            locked += errors
+        for worker in workers:
+            worker.join()
+        return completed / options['duration'], len(statements), writes, locked
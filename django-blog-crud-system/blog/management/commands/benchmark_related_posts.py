@@ -0,0 +1,47 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from blog.benchmarking import seeded_test_database
+from blog.models import Post
+from blog.related import rebuild_related_posts, related_posts, update_related_posts
+
+
+class Command(BaseCommand):
+    help = 'Measure related-posts rebuild time, incremental update cost and detail lookup cost'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+        parser.add_argument('--authors', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        for size in options['sizes']:
+            with seeded_test_database(size, options['authors']):
+                self.run_size(size, options['repeat'])
+
+    def run_size(self, size, repeat):
+        started = time.perf_counter()
+        rebuild_related_posts()
+        rebuild = time.perf_counter() - started
+
+        posts = list(Post.objects.order_by('?')[:repeat])
+        updates = self.measure(posts, update_related_posts)
+        lookups = self.measure(posts, related_posts)
+        with CaptureQueriesContext(connection) as queries:
+            related_posts(posts[0])
+
+        self.stdout.write(self.style.SUCCESS(f'=== {size} posts ==='))
+        self.stdout.write(f'full rebuild: {rebuild:.1f}s')
+        self.stdout.write(f'incremental update: {updates * 1000:.1f}ms median')
+        self.stdout.write(f'detail lookup: {lookups * 1000:.2f}ms median, {len(queries)} query')
+
+    def measure(self, posts, func):
+        timings = []
+        for post in posts:
+            started = time.perf_counter()
+            func(post)
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
@@ -0,0 +1,72 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from blog.models import Post
+from blog.sample_data import SampleDataGenerator
+from blog.search import SQLiteFTSBackend
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare full-text search against the icontains filter at different post volumes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+        parser.add_argument('--queries', nargs='+', default=['django', 'cache query', 'kubernetes'])
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--authors', type=int, default=100)
+
+    def handle(self, *args, **options):
+        for size in options['sizes']:
+            try:
+                with transaction.atomic():
+                    self.run_size(size, options)
+                    raise Rollback
+            except Rollback:
+                pass
+
+    def run_size(self, size, options):
+        missing = size - Post.objects.count()
+        batch_size = options['batch_size']
+        if missing > 0:
+            SampleDataGenerator(seed=size).generate(
+                missing, authors=options['authors'], batch_size=batch_size, rebuild_index=False
+            )
+
+        backend = SQLiteFTSBackend()
+        started = time.perf_counter()
+        backend.rebuild(Post.objects.all(), batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(
+            f'=== {size} posts (index rebuilt in {time.perf_counter() - started:.2f}s) ==='
+        ))
+
+        for query in options['queries']:
+            contains = self.measure(options['repeat'], lambda: list(
+                Post.objects.filter(
+                    Q(title__icontains=query) |
+                    Q(content__icontains=query) |
+                    Q(author__username__icontains=query)
+                ).order_by('-created_at')[:6]
+            ))
+            fts = self.measure(options['repeat'], lambda: list(
+                backend.search(Post.objects.all(), query).order_by('search_rank', '-created_at')[:6]
+            ))
+            self.stdout.write(
+                f'{query!r}: icontains {contains * 1000:.1f}ms, fts {fts * 1000:.1f}ms, '
+                f'speedup {contains / fts if fts else 0:.1f}x'
+            )
+
+    def measure(self, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
@@ -0,0 +1,108 @@
+import multiprocessing
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+from django.test import Client
+from django.urls import reverse
+from blog.benchmarking import seeded_test_database
+from blog.models import Post
+
+PROFILES = {
+    'baseline': lambda: {},
+    'production': lambda: settings.SQLITE_OPTIONS,
+}
+
+
+def run_worker(role, author_id, post_ids, duration, seed, results):
+    rng = random.Random(seed)
+    client = Client()
+    own_post = None
+    if role == 'writer':
+        author = User.objects.get(pk=author_id)
+        client.force_login(author)
+        own_post = Post.objects.filter(author=author).values_list('pk', flat=True).first()
+
+    completed = locked = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        try:
+            if role == 'writer':
+                data = {'title': f'Stress post {rng.random():.6f}', 'content': 'Stress content body. ' * 40}
+                if own_post is None or completed % 2 == 0:
+                    response = client.post(reverse('post_create'), data)
+                else:
+                    response = client.post(reverse('post_edit', kwargs={'pk': own_post}), data)
+            elif completed % 2 == 0:
+                response = client.get(reverse('home'))
+            else:
+                response = client.get(reverse('post_detail', kwargs={'pk': rng.choice(post_ids)}))
+            if response.status_code < 400:
+                completed += 1
+        except OperationalError:
+            locked += 1
+    results.put((role, completed, locked))
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Stress SQLite with concurrent reader and writer processes, with and without the production profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=2000)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--duration', type=float, default=10.0)
+        parser.add_argument('--profiles', nargs='+', choices=list(PROFILES), default=list(PROFILES))
+
+    def handle(self, *args, **options):
+        context = multiprocessing.get_context('fork')
+        summary = {}
+        for profile in options['profiles']:
+            with tempfile.TemporaryDirectory() as directory:
+                test_name = str(Path(directory) / 'stress.sqlite3')
+                with seeded_test_database(
+                    options['posts'], options['writers'], test_name=test_name, options=PROFILES[profile]()
+                ):
+                    summary[profile] = self.run_profile(context, options)
+            self.stdout.write(f'{profile}: done')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'=== {options["readers"]} readers, {options["writers"]} writers, {options["duration"]:.0f}s ==='
+        ))
+        self.stdout.write(f'{"profile":<12} {"reads/s":>9} {"writes/s":>9} {"locked":>8}')
+        for profile, (reads, writes, locked) in summary.items():
+            self.stdout.write(f'{profile:<12} {reads:>9.1f} {writes:>9.1f} {locked:>8}')
+
+    def run_profile(self, context, options):
+        post_ids = list(Post.objects.values_list('pk', flat=True))
+        author_ids = list(User.objects.order_by('pk').values_list('pk', flat=True))
+        connections.close_all()
+
+        results = context.Queue()
+        workers = [
+            context.Process(target=run_worker, args=('reader', None, post_ids, options['duration'], index, results))
+            for index in range(options['readers'])
+        ] + [
+            context.Process(
+                target=run_worker,
+                args=('writer', author_ids[index % len(author_ids)], post_ids, options['duration'], index, results),
+            )
+            for index in range(options['writers'])
+        ]
+        for worker in workers:
+            worker.start()
+        totals = {'reader': 0, 'writer': 0}
+        locked = 0
+        for _ in workers:
+            role, completed, errors = results.get()
+            totals[role] += completed
+            locked += errors
+        for worker in workers:
+            worker.join()
+        return totals['reader'] / options['duration'], totals['writer'] / options['duration'], locked
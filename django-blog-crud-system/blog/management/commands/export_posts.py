@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from blog.export import CONTENT_TYPES, ExportError, export_queryset, iter_export
+
+class Command(BaseCommand):
+    help = 'Stream blog posts as NDJSON or JSON, optionally filtered by author, date range or since cursor'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(CONTENT_TYPES), default='ndjson')
+        parser.add_argument('--author')
+        parser.add_argument('--start', help='YYYY-MM-DD, inclusive')
+        parser.add_argument('--end', help='YYYY-MM-DD, inclusive')
+        parser.add_argument('--since', help='ISO timestamp or cursor from a previous export')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--output', help='File path, defaults to stdout')
+
+    def handle(self, *args, **options):
+        try:
+            queryset, paginator = export_queryset(
+                author=options['author'],
+                start=options['start'],
+                end=options['end'],
+                since=options['since'],
+            )
+        except ExportError as error:
+            raise CommandError(str(error))
+
+        chunks = iter_export(options['format'], queryset, paginator, options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.writelines(chunks)
+        else:
+            self.stdout.ending = ''
+            for chunk in chunks:
+                self.stdout.write(chunk)
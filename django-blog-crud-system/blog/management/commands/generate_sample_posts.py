@@ -1,49 +1,41 @@
+import time
+
 from django.core.management.base import BaseCommand
-from django.contrib.auth.models import User
-from blog.models import Post
-import random
+from blog.sample_data import CONTENT_SIZES, DEMO_PASSWORD, SampleDataGenerator
 
 class Command(BaseCommand):
-    help = 'Generate sample blog posts for testing'
+    help = 'Generate sample blog posts for testing and load benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10)
+        parser.add_argument('--authors', type=int, default=1)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--content-size-distribution', choices=sorted(CONTENT_SIZES), default='uniform')
+        parser.add_argument('--days', type=int, default=365)
+        parser.add_argument('--skip-index', action='store_true')
+
+    def handle(self, *args, **options):
+        generator = SampleDataGenerator(
+            seed=options['seed'],
+            content_size=options['content_size_distribution'],
+            days=options['days'],
+        )
+        started = time.perf_counter()
+        report_every = max(options['batch_size'], options['posts'] // 20)
+
+        def progress(created):
+            if created % report_every < options['batch_size'] or created == options['posts']:
+                self.stdout.write(f'{created}/{options["posts"]} posts ({time.perf_counter() - started:.1f}s)')
 
-    def handle(self, *args, **kwargs):
-        titles = [
-            'Introduction to Django Web Development',
-            'Building RESTful APIs with Python',
-            'Best Practices for Database Design',
-            'Understanding Authentication Systems',
-            'Modern CSS Techniques',
-            'JavaScript Frameworks Comparison',
-            'DevOps and Continuous Integration',
-            'Machine Learning Basics',
-            'Cloud Computing Essentials',
-            'Cybersecurity Best Practices',
-        ]
-        
-        contents = [
-            'This is a comprehensive guide exploring the fundamental concepts and advanced techniques. Learn how to build scalable applications with clean architecture and best practices.',
-            'Discover the powerful features and capabilities that make development efficient and maintainable. This post covers everything from basics to advanced patterns.',
-            'Deep dive into professional development practices that will elevate your coding skills. Real-world examples and practical demonstrations included.',
-            'Explore the modern approaches to building robust and secure applications. This guide provides step-by-step instructions and code examples.',
-            'A detailed walkthrough of implementing industry-standard solutions in your projects. Learn from experienced developers and avoid common pitfalls.',
-        ]
-        
-        if not User.objects.filter(username='demo').exists():
-            demo_user = User.objects.create_user(
-                username='demo',
-                email='demo@example.com',
-                password='demo123456'
-            )
-            self.stdout.write(self.style.SUCCESS('Created demo user'))
-        else:
-            demo_user = User.objects.get(username='demo')
-        
-        for i, title in enumerate(titles):
-            content = random.choice(contents)
-            Post.objects.create(
-                title=title,
-                content=content,
-                author=demo_user
-            )
-        
-        self.stdout.write(self.style.SUCCESS(f'Successfully created {len(titles)} sample posts'))
+        created = generator.generate(
+            options['posts'],
+            authors=max(1, options['authors']),
+            batch_size=options['batch_size'],
+            rebuild_index=not options['skip_index'],
+            progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully created {created} sample posts across {max(1, options["authors"])} authors '
+            f'in {time.perf_counter() - started:.1f}s (password for all authors: {DEMO_PASSWORD})'
+        ))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from blog.cache import CACHED_FEEDS, CACHED_VIEWS, get_stats, reset_stats
+
+class Command(BaseCommand):
+    help = 'Show hit/miss ratios of the public page cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('=== Page Cache Statistics ==='))
+        for view_name, stats in get_stats(CACHED_VIEWS + CACHED_FEEDS).items():
+            self.stdout.write(
+                f"{view_name}: {stats['hits']} hits, {stats['misses']} misses, "
+                f"hit ratio {stats['hit_ratio']:.1%}"
+            )
+        if options['reset']:
+            reset_stats(CACHED_VIEWS + CACHED_FEEDS)
+            self.stdout.write(self.style.WARNING('Statistics reset'))
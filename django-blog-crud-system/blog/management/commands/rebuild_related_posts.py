@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+from blog.related import RELATED_POSTS, rebuild_related_posts, refresh_stale_related_posts
+
+class Command(BaseCommand):
+    help = 'Rebuild TF-IDF vectors and the top-k related posts table, or refresh only posts saved since the last run'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--neighbors', type=int, default=RELATED_POSTS)
+        parser.add_argument('--stale', action='store_true')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['stale']:
+            total = refresh_stale_related_posts(k=options['neighbors'], batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f'Related posts refreshed for {total} saved posts in {time.perf_counter() - started:.1f}s'
+            ))
+            return
+        total = rebuild_related_posts(k=options['neighbors'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Related posts rebuilt for {total} posts in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from blog.models import Post
+from blog.search import get_search_backend
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for all blog posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        indexed = get_search_backend().rebuild(Post.objects.all(), batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} posts'))
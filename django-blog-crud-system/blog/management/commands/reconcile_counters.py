@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from blog.models import reconcile_monthly_stats, reconcile_post_counters, reconcile_tag_counters
+
+class Command(BaseCommand):
+    help = 'Recompute denormalized post counters on profiles, tags and the monthly post rollup and repair drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        drifted = reconcile_post_counters(batch_size=options['batch_size'], dry_run=options['dry_run'])
+        drifted_tags = reconcile_tag_counters(dry_run=options['dry_run'])
+        drifted_months = reconcile_monthly_stats(dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{drifted} profiles have drifted counters'))
+            self.stdout.write(self.style.WARNING(f'{drifted_tags} tags have drifted counters'))
+            self.stdout.write(self.style.WARNING(f'{drifted_months} monthly stats rows have drifted'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Repaired counters on {drifted} profiles'))
+            self.stdout.write(self.style.SUCCESS(f'Repaired counters on {drifted_tags} tags'))
+            self.stdout.write(self.style.SUCCESS(f'Repaired {drifted_months} monthly stats rows'))
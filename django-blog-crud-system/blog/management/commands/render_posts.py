@@ -0,0 +1,61 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from blog.cache import bump_generations, post_generation
+from blog.models import Post
+from blog.rendering import render_rows, renderer_signature
+
+class Command(BaseCommand):
+    help = 'Re-render stored Markdown HTML for posts whose content or renderer version changed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--force', action='store_true')
+
+    def handle(self, *args, **options):
+        signature = renderer_signature()
+        started = time.perf_counter()
+        batches = self.iter_batches(options['batch_size'], options['force'])
+
+        if options['workers'] <= 1:
+            rendered = sum(self.store(render_rows(rows, signature)) for rows in batches)
+        else:
+            rendered = 0
+            with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+                pending = deque()
+                for rows in batches:
+                    pending.append(executor.submit(render_rows, rows, signature))
+                    if len(pending) >= options['workers'] * 2:
+                        rendered += self.store(pending.popleft().result())
+                while pending:
+                    rendered += self.store(pending.popleft().result())
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rendered {rendered} posts with {signature} in {time.perf_counter() - started:.1f}s'
+        ))
+
+    def iter_batches(self, batch_size, force):
+        last_pk = 0
+        while True:
+            rows = list(
+                Post.objects.filter(pk__gt=last_pk).order_by('pk')
+                .values_list('pk', 'content', 'content_html_key')[:batch_size]
+            )
+            if not rows:
+                return
+            last_pk = rows[-1][0]
+            yield [(pk, content, '' if force else key) for pk, content, key in rows]
+
+    def store(self, rendered):
+        if not rendered:
+            return 0
+        Post.objects.bulk_update(
+            [Post(pk=pk, content_html_key=key, content_html=body) for pk, key, body in rendered],
+            ['content_html', 'content_html_key'],
+        )
+        bump_generations([post_generation(pk) for pk, _, _ in rendered])
+        return len(rendered)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from blog.replicas import replica_aliases, sync_sqlite_replica
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database into the replica databases to simulate replication locally'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--databases', nargs='+')
+
+    def handle(self, *args, **options):
+        aliases = options['databases'] or replica_aliases() or ['replica']
+        for alias in aliases:
+            sync_sqlite_replica(alias)
+            self.stdout.write(self.style.SUCCESS(f'Replica {alias} synced from primary'))
@@ -0,0 +1,154 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import Template as DjangoTemplate
+
+logger = logging.getLogger('blog.instrumentation')
+current_metrics = ContextVar('current_metrics', default=None)
+
+WHITESPACE_RE = re.compile(r'\s+')
+IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+
+
+def fingerprint(sql):
+    return IN_LIST_RE.sub('IN (...)', WHITESPACE_RE.sub(' ', sql).strip())
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total_time = 0.0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.fingerprints = Counter()
+
+    def record_query(self, sql, duration):
+        self.db_time += duration
+        self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def query_count(self):
+        return sum(self.fingerprints.values())
+
+    def repeated(self, threshold=2):
+        return {sql: count for sql, count in self.fingerprints.items() if count >= threshold}
+
+    def finish(self):
+        self.total_time = time.perf_counter() - self.started
+
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, time.perf_counter() - started)
+
+
+def install_query_recorder():
+    for connection in connections.all():
+        if record_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(record_query)
+
+
+def instrument_templates():
+    if getattr(DjangoTemplate.render, 'instrumented', False):
+        return
+    original_render = DjangoTemplate.render
+
+    def render(self, context=None, request=None):
+        metrics = current_metrics.get()
+        if metrics is None:
+            return original_render(self, context, request)
+        started = time.perf_counter()
+        metrics.template_depth += 1
+        try:
+            return original_render(self, context, request)
+        finally:
+            metrics.template_depth -= 1
+            if not metrics.template_depth:
+                metrics.template_time += time.perf_counter() - started
+
+    render.instrumented = True
+    DjangoTemplate.render = render
+
+
+class RequestInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        self.server_timing = getattr(settings, 'INSTRUMENTATION_SERVER_TIMING', True)
+        self.log_json = getattr(settings, 'INSTRUMENTATION_LOG_JSON', False)
+        self.n_plus_one_threshold = getattr(settings, 'INSTRUMENTATION_N_PLUS_ONE_THRESHOLD', 5)
+        instrument_templates()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        install_query_recorder()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        metrics.finish()
+        self.report(request, response, metrics)
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        await sync_to_async(install_query_recorder)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        metrics.finish()
+        self.report(request, response, metrics)
+        return response
+
+    def report(self, request, response, metrics):
+        duplicates = metrics.repeated()
+        n_plus_one = metrics.repeated(self.n_plus_one_threshold)
+        for sql, count in n_plus_one.items():
+            logger.warning('Possible N+1 query on %s: %d x %s', request.path, count, sql)
+
+        if self.server_timing:
+            timings = [
+                f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.query_count} queries"',
+                f'tpl;dur={metrics.template_time * 1000:.2f}',
+                f'total;dur={metrics.total_time * 1000:.2f}',
+            ]
+            if duplicates:
+                timings.append(f'dup;desc="{sum(duplicates.values())} repeated queries"')
+            response['Server-Timing'] = ', '.join(timings)
+
+        if self.log_json:
+            logger.info(json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'queries': metrics.query_count,
+                'db_ms': round(metrics.db_time * 1000, 2),
+                'template_ms': round(metrics.template_time * 1000, 2),
+                'total_ms': round(metrics.total_time * 1000, 2),
+                'duplicates': duplicates,
+                'n_plus_one': sorted(n_plus_one),
+            }))
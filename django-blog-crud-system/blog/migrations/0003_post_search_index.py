@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_fts "
+        "USING fts5(title, content, author, tokenize='porter unicode61')"
+    )
+    schema_editor.execute(
+        "INSERT INTO blog_post_fts (rowid, title, content, author) "
+        "SELECT blog_post.id, blog_post.title, blog_post.content, auth_user.username "
+        "FROM blog_post INNER JOIN auth_user ON auth_user.id = blog_post.author_id"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS blog_post_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_userprofile'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:26
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def backfill_post_counters(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    Post = apps.get_model('blog', 'Post')
+    UserProfile = apps.get_model('blog', 'UserProfile')
+    db_alias = schema_editor.connection.alias
+
+    missing = User.objects.using(db_alias).filter(profile__isnull=True).values_list('pk', flat=True)
+    UserProfile.objects.using(db_alias).bulk_create(
+        [UserProfile(user_id=user_id) for user_id in list(missing)],
+        batch_size=1000,
+    )
+
+    cutoff = timezone.now() - timedelta(days=7)
+    posts = Post.objects.using(db_alias).filter(author=OuterRef('user')).order_by().values('author')
+    UserProfile.objects.using(db_alias).update(
+        post_count=Coalesce(Subquery(posts.annotate(total=Count('id')).values('total')), 0),
+        recent_post_count=Coalesce(
+            Subquery(posts.filter(created_at__gte=cutoff).annotate(total=Count('id')).values('total')), 0
+        ),
+        last_post_at=Subquery(posts.annotate(latest=Max('created_at')).values('latest')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_post_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='last_post_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='recent_post_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_post_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_userprofile_post_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['updated_at'], name='blog_post_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', 'updated_at'], name='blog_post_author_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+from django.utils.text import Truncator
+
+BATCH_SIZE = 500
+
+
+def backfill_excerpts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.using(schema_editor.connection.alias)
+    last_pk = 0
+    while True:
+        batch = list(
+            posts.filter(pk__gt=last_pk).order_by('pk').only('pk', 'content')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for post in batch:
+            post.excerpt = Truncator(post.content).words(20)
+            post.word_count = len(post.content.split())
+            post.reading_time = max(1, -(-post.word_count // 200))
+        posts.bulk_update(batch, ['excerpt', 'word_count', 'reading_time'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_excerpts, migrations.RunPython.noop),
+    ]
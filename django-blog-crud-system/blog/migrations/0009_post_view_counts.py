@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_backfill_post_excerpts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='PostWeeklyViews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weekly_views', to='blog.post')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['week', '-views'], name='blog_weekly_views_rank_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='postweeklyviews',
+            constraint=models.UniqueConstraint(fields=('week', 'post'), name='blog_weekly_views_week_post_uniq'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_view_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='content_html_key',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
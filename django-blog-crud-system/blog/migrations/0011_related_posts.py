@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_post_content_html'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=40, unique=True)),
+                ('idf', models.FloatField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PostTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=40)),
+                ('weight', models.FloatField()),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='blog.post')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RelatedPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='blog.post')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.post')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['post', '-score'], name='blog_related_post_rank_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='relatedpost',
+            constraint=models.UniqueConstraint(fields=('post', 'related'), name='blog_related_post_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='postterm',
+            index=models.Index(fields=['term', '-weight'], name='blog_post_term_weight_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='postterm',
+            constraint=models.UniqueConstraint(fields=('post', 'term'), name='blog_post_term_uniq'),
+        ),
+    ]
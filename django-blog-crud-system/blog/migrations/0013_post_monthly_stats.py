@@ -0,0 +1,63 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:10
+
+from collections import Counter
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def backfill_monthly_stats(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    PostMonthlyStats = apps.get_model('blog', 'PostMonthlyStats')
+    db_alias = schema_editor.connection.alias
+
+    totals = Counter()
+    rows = (
+        Post.objects.using(db_alias).order_by().annotate(month=TruncMonth('created_at'))
+        .values('author', 'month').annotate(total=Count('id'))
+    )
+    for row in rows.iterator():
+        month = row['month']
+        month = (timezone.localtime(month) if timezone.is_aware(month) else month).date()
+        totals[row['author'], month] += row['total']
+        totals[None, month] += row['total']
+    PostMonthlyStats.objects.using(db_alias).bulk_create(
+        [PostMonthlyStats(author_id=author_id, month=month, post_count=total) for (author_id, month), total in totals.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0012_post_tags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostMonthlyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('post_count', models.PositiveIntegerField(default=0)),
+                ('author', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='monthly_post_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'post monthly stats',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='postmonthlystats',
+            constraint=models.UniqueConstraint(fields=('author', 'month'), name='blog_monthly_stats_author_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='postmonthlystats',
+            constraint=models.UniqueConstraint(condition=models.Q(('author__isnull', True)), fields=('month',), name='blog_monthly_stats_global_uniq'),
+        ),
+        migrations.RunPython(backfill_monthly_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_post_monthly_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='related_stale',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('related_stale', True)), fields=['id'], name='blog_post_related_stale_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:37
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_post_related_stale'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='recent_post_count',
+        ),
+    ]
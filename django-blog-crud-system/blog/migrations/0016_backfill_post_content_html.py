@@ -0,0 +1,35 @@
+from django.db import migrations
+
+from blog.rendering import render_rows, renderer_signature
+
+BATCH_SIZE = 500
+
+
+def backfill_content_html(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.using(schema_editor.connection.alias)
+    signature = renderer_signature()
+    last_pk = 0
+    while True:
+        rows = list(
+            posts.filter(pk__gt=last_pk).order_by('pk')
+            .values_list('pk', 'content', 'content_html_key')[:BATCH_SIZE]
+        )
+        if not rows:
+            break
+        posts.bulk_update(
+            [Post(pk=pk, content_html_key=key, content_html=body) for pk, key, body in render_rows(rows, signature)],
+            ['content_html', 'content_html_key'],
+        )
+        last_pk = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_remove_userprofile_recent_post_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_content_html, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations, models
+from django.db.models import Max
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+
+def backfill_last_modified(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    PostMonthlyStats = apps.get_model('blog', 'PostMonthlyStats')
+    db_alias = schema_editor.connection.alias
+
+    last_modified = {}
+    rows = (
+        Post.objects.using(db_alias).order_by().annotate(month=TruncMonth('created_at'))
+        .values('author', 'month').annotate(lastmod=Max('updated_at'))
+    )
+    for row in rows.iterator():
+        month = row['month']
+        month = (timezone.localtime(month) if timezone.is_aware(month) else month).date()
+        for key in ((row['author'], month), (None, month)):
+            last_modified[key] = max(last_modified.get(key, row['lastmod']), row['lastmod'])
+
+    stats = list(PostMonthlyStats.objects.using(db_alias).only('author_id', 'month'))
+    for row in stats:
+        row.last_modified = last_modified.get((row.author_id, row.month))
+    PostMonthlyStats.objects.using(db_alias).bulk_update(stats, ['last_modified'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_backfill_post_content_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postmonthlystats',
+            name='last_modified',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_last_modified, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,74 @@
-from django.db import models
+from collections import Counter
+from datetime import timedelta
+from django.db import models, transaction
+from django.db.models import DEFERRED, Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest, TruncMonth
 from django.contrib.auth.models import User
 from django.urls import reverse
-from django.db.models.signals import post_save
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+from django.utils.text import Truncator, slugify
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from .search import get_search_backend
+from .rendering import content_key, render_markdown
+from .cache import (
+    bump_generations, GLOBAL_GENERATION, author_generation, month_generation, month_section, post_generation,
+)
+
+EXCERPT_WORDS = 20
+WORDS_PER_MINUTE = 200
+POST_CARD_FIELDS = ('title', 'excerpt', 'reading_time', 'created_at', 'updated_at', 'author__username')
+
+class PostQuerySet(models.QuerySet):
+    def cards(self):
+        return self.select_related('author').only(*POST_CARD_FIELDS)
+    
+    def recent(self, author, now=None):
+        return self.filter(author=author, created_at__gte=(now or timezone.now()) - RECENT_POSTS_WINDOW)
+
+MAX_TAGS_PER_POST = 10
+
+def parse_tag_names(value, limit=MAX_TAGS_PER_POST):
+    names = {}
+    for name in value.split(','):
+        name = ' '.join(name.split())[:50]
+        slug = slugify(name)
+        if slug and slug not in names and len(names) < limit:
+            names[slug] = name
+    return names
+
+class TagQuerySet(models.QuerySet):
+    def popular(self, limit=20):
+        return self.filter(post_count__gt=0).order_by('-post_count', 'slug')[:limit]
+    
+    def matching(self, query, limit=8):
+        slugs = [slugify(word) for word in query.split()]
+        condition = models.Q()
+        for slug in filter(None, slugs):
+            condition |= models.Q(slug__startswith=slug)
+        if not condition:
+            return self.none()
+        return self.filter(condition, post_count__gt=0).order_by('-post_count', 'slug')[:limit]
+
+class Tag(models.Model):
+    name = models.CharField(max_length=50)
+    slug = models.SlugField(max_length=50, unique=True)
+    post_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    objects = TagQuerySet.as_manager()
+    
+    class Meta:
+        ordering = ['name']
+        indexes = [
+            models.Index(fields=['-post_count', 'slug'], name='blog_tag_count_idx'),
+        ]
+    
+    def __str__(self):
+        return self.name
+    
+    def get_absolute_url(self):
+        return reverse('tag_posts', kwargs={'slug': self.slug})
 
 class Post(models.Model):
     title = models.CharField(max_length=200)
@@ -10,9 +76,27 @@ class Post(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    excerpt = models.TextField(blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveIntegerField(default=1, editable=False)
+    view_count = models.PositiveIntegerField(default=0, editable=False)
+    content_html = models.TextField(blank=True, editable=False)
+    content_html_key = models.CharField(max_length=64, blank=True, editable=False)
+    related_stale = models.BooleanField(default=False, editable=False)
+    tags = models.ManyToManyField(Tag, through='PostTag', related_name='posts', blank=True)
+    
+    objects = PostQuerySet.as_manager()
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='blog_post_created_id_idx'),
+            models.Index(fields=['title', 'id'], name='blog_post_title_id_idx'),
+            models.Index(fields=['author', 'created_at', 'id'], name='blog_post_author_created_idx'),
+            models.Index(fields=['updated_at'], name='blog_post_updated_idx'),
+            models.Index(fields=['author', 'updated_at'], name='blog_post_author_updated_idx'),
+            models.Index(fields=['id'], condition=models.Q(related_stale=True), name='blog_post_related_stale_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -20,21 +104,318 @@ class Post(models.Model):
     def get_absolute_url(self):
         return reverse('post_detail', kwargs={'pk': self.pk})
     
+    def save(self, *args, **kwargs):
+        self.update_derived_fields()
+        update_fields = kwargs.get('update_fields')
+        text_changed = update_fields is None or bool({'title', 'content'} & set(update_fields))
+        if text_changed:
+            self.related_stale = True
+        if update_fields is not None:
+            derived = {'related_stale'} if text_changed else set()
+            if 'content' in update_fields:
+                derived.update(('excerpt', 'word_count', 'reading_time', 'content_html', 'content_html_key'))
+            kwargs['update_fields'] = {*update_fields, *derived}
+        super().save(*args, **kwargs)
+    
+    def update_derived_fields(self):
+        self.excerpt = Truncator(self.content).words(EXCERPT_WORDS)
+        self.word_count = len(self.content.split())
+        self.reading_time = max(1, -(-self.word_count // WORDS_PER_MINUTE))
+        self.render_content()
+    
+    def render_content(self):
+        key = content_key(self.content)
+        if key != self.content_html_key:
+            self.content_html = render_markdown(self.content)
+            self.content_html_key = key
+    
+    @property
+    def body_html(self):
+        if self.content_html_key != content_key(self.content):
+            return mark_safe(render_markdown(self.content))
+        return mark_safe(self.content_html)
+    
+    def set_tags(self, value):
+        names = parse_tag_names(value)
+        Tag.objects.bulk_create(
+            [Tag(name=name, slug=slug) for slug, name in names.items()], ignore_conflicts=True
+        )
+        wanted = set(Tag.objects.filter(slug__in=list(names)).values_list('pk', flat=True))
+        current = set(self.post_tags.values_list('tag_id', flat=True))
+        PostTag.objects.filter(post=self, tag_id__in=current - wanted).delete()
+        added = wanted - current
+        PostTag.objects.bulk_create(
+            [PostTag(post=self, tag_id=tag_id, created_at=self.created_at) for tag_id in added]
+        )
+        Tag.objects.filter(pk__in=added).update(post_count=F('post_count') + 1)
+        if added or current - wanted:
+            bump_generations([GLOBAL_GENERATION, post_generation(self.pk)])
+    
     @property
     def is_recently_updated(self):
         return self.updated_at > self.created_at
 
-class UserProfile(models.Model):
+class PostTag(models.Model):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='post_tags')
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='post_tags')
+    created_at = models.DateTimeField()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'tag'], name='blog_post_tag_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['tag', '-created_at', '-post'], name='blog_post_tag_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.post_id} #{self.tag_id}'
+
+class PostWeeklyViews(models.Model):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='weekly_views')
+    week = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['week', 'post'], name='blog_weekly_views_week_post_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['week', '-views'], name='blog_weekly_views_rank_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.post_id} week of {self.week}: {self.views}'
+
+def month_start(value):
+    value = timezone.localtime(value) if timezone.is_aware(value) else value
+    return value.date().replace(day=1)
+
+class PostMonthlyStatsQuerySet(models.QuerySet):
+    def for_author(self, author=None):
+        if author is None:
+            return self.filter(author__isnull=True)
+        return self.filter(author=author)
+    
+    def months(self, author=None):
+        return self.for_author(author).filter(post_count__gt=0).order_by('-month')
+
+class PostMonthlyStats(models.Model):
+    author = models.ForeignKey(
+        User, on_delete=models.CASCADE, null=True, blank=True, related_name='monthly_post_stats'
+    )
+    month = models.DateField()
+    post_count = models.PositiveIntegerField(default=0)
+    last_modified = models.DateTimeField(null=True, blank=True)
+    
+    objects = PostMonthlyStatsQuerySet.as_manager()
+    
+    class Meta:
+        verbose_name_plural = 'post monthly stats'
+        constraints = [
+            models.UniqueConstraint(fields=['author', 'month'], name='blog_monthly_stats_author_uniq'),
+            models.UniqueConstraint(
+                fields=['month'], condition=models.Q(author__isnull=True), name='blog_monthly_stats_global_uniq'
+            ),
+        ]
+    
+    def __str__(self):
+        return f'{self.author or "all authors"} {self.month:%Y-%m}: {self.post_count}'
+
+class RelatedTerm(models.Model):
+    term = models.CharField(max_length=40, unique=True)
+    idf = models.FloatField()
+    
+    def __str__(self):
+        return self.term
+
+class PostTerm(models.Model):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='terms')
+    term = models.CharField(max_length=40)
+    weight = models.FloatField()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'term'], name='blog_post_term_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['term', '-weight'], name='blog_post_term_weight_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.post_id}: {self.term}'
+
+class RelatedPost(models.Model):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='related_links')
+    related = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'related'], name='blog_related_post_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['post', '-score'], name='blog_related_post_rank_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.post_id} -> {self.related_id}'
+
+RECENT_POSTS_WINDOW = timedelta(days=7)
+
+class DirtyFieldsMixin:
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if value is not DEFERRED
+        }
+        return instance
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_values = {field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields}
+    
+    def get_dirty_fields(self):
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return None
+        return [
+            field.name for field in self._meta.concrete_fields
+            if field.attname in loaded and getattr(self, field.attname) != loaded[field.attname]
+        ]
+    
+    def save_dirty_fields(self):
+        dirty = self.get_dirty_fields()
+        if dirty is None:
+            self.save()
+            return True
+        if not dirty:
+            return False
+        auto_now = [field.name for field in self._meta.concrete_fields if getattr(field, 'auto_now', False)]
+        self.save(update_fields=set(dirty + auto_now))
+        return True
+
+class UserProfile(DirtyFieldsMixin, models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     bio = models.TextField(max_length=500, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    post_count = models.PositiveIntegerField(default=0)
+    last_post_at = models.DateTimeField(null=True, blank=True)
     
     def __str__(self):
         return f'{self.user.username} Profile'
     
     @property
     def total_posts(self):
-        return self.user.posts.count()
+        return self.post_count
+    
+    @property
+    def posts_this_week(self):
+        if self.last_post_at is None or self.last_post_at < timezone.now() - RECENT_POSTS_WINDOW:
+            return 0
+        return Post.objects.recent(self.user_id).count()
+
+def recent_post_count_expression(now=None):
+    posts = Post.objects.recent(OuterRef('user'), now).order_by().values('author')
+    return Coalesce(Subquery(posts.annotate(total=Count('id')).values('total')), 0)
+
+def post_counter_expressions():
+    posts = Post.objects.filter(author=OuterRef('user')).order_by().values('author')
+    return {
+        'post_count': Coalesce(Subquery(posts.annotate(total=Count('id')).values('total')), 0),
+        'last_post_at': Subquery(posts.annotate(latest=Max('created_at')).values('latest')),
+    }
+
+def reconcile_post_counters(queryset=None, batch_size=1000, dry_run=False):
+    queryset = UserProfile.objects.all() if queryset is None else queryset
+    fields = ('post_count', 'last_post_at')
+    expected = {f'expected_{name}': expression for name, expression in post_counter_expressions().items()}
+    rows = queryset.order_by('pk').annotate(**expected).values_list(
+        'pk', *fields, *expected
+    )
+    drifted = []
+    repaired = 0
+    for row in rows.iterator(chunk_size=batch_size):
+        if row[1:3] != row[3:5]:
+            drifted.append(row[0])
+        if len(drifted) >= batch_size:
+            repaired += _repair_counters(drifted, dry_run)
+            drifted = []
+    if drifted:
+        repaired += _repair_counters(drifted, dry_run)
+    return repaired
+
+def _repair_counters(profile_ids, dry_run):
+    if not dry_run:
+        UserProfile.objects.filter(pk__in=profile_ids).update(**post_counter_expressions())
+    return len(profile_ids)
+
+def reconcile_tag_counters(dry_run=False):
+    expected = Coalesce(
+        Subquery(
+            PostTag.objects.filter(tag=OuterRef('pk')).order_by().values('tag')
+            .annotate(total=Count('id')).values('total')
+        ),
+        0,
+    )
+    drifted = list(
+        Tag.objects.annotate(expected=expected).exclude(post_count=F('expected')).values_list('pk', flat=True)
+    )
+    if drifted and not dry_run:
+        Tag.objects.filter(pk__in=drifted).update(post_count=expected)
+    return len(drifted)
+
+def expected_monthly_stats():
+    expected = Counter()
+    last_modified = {}
+    rows = (
+        Post.objects.order_by().annotate(month=TruncMonth('created_at'))
+        .values('author', 'month').annotate(total=Count('id'), lastmod=Max('updated_at'))
+    )
+    for row in rows.iterator():
+        month = month_start(row['month'])
+        for key in ((row['author'], month), (None, month)):
+            expected[key] += row['total']
+            last_modified[key] = max(last_modified.get(key, row['lastmod']), row['lastmod'])
+    return expected, last_modified
+
+def reconcile_monthly_stats(dry_run=False):
+    expected, last_modified = expected_monthly_stats()
+    current = {
+        (author_id, month): (pk, post_count, modified)
+        for pk, author_id, month, post_count, modified in PostMonthlyStats.objects.values_list(
+            'pk', 'author', 'month', 'post_count', 'last_modified'
+        ).iterator()
+    }
+    drifted = {
+        key for key, (_, post_count, modified) in current.items()
+        if expected.get(key, 0) != post_count
+        or key in last_modified and (modified is None or modified < last_modified[key])
+    }
+    drifted.update(key for key in expected if key not in current)
+    if drifted and not dry_run:
+        with transaction.atomic():
+            PostMonthlyStats.objects.filter(pk__in=[current[key][0] for key in drifted if key in current]).delete()
+            PostMonthlyStats.objects.bulk_create([
+                PostMonthlyStats(
+                    author_id=author_id, month=month, post_count=expected[author_id, month],
+                    last_modified=last_modified[author_id, month],
+                )
+                for author_id, month in drifted if expected.get((author_id, month))
+            ])
+    return len(drifted)
+
+def adjust_monthly_stats(post, delta, modified):
+    month = month_start(post.created_at)
+    if delta > 0:
+        PostMonthlyStats.objects.bulk_create(
+            [PostMonthlyStats(author_id=post.author_id, month=month), PostMonthlyStats(month=month)],
+            ignore_conflicts=True,
+        )
+    PostMonthlyStats.objects.filter(
+        models.Q(author_id=post.author_id) | models.Q(author__isnull=True), month=month
+    ).update(post_count=Greatest(F('post_count') + delta, 0), last_modified=modified)
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -43,5 +424,58 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
+    profile = User.profile.related.get_cached_value(instance, None)
+    if profile is not None:
+        profile.save_dirty_fields()
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, raw=False, **kwargs):
+    if not raw:
+        get_search_backend().index(instance)
+
+@receiver(post_delete, sender=PostTag)
+def decrement_tag_counter(sender, instance, **kwargs):
+    Tag.objects.filter(pk=instance.tag_id).update(post_count=Greatest(F('post_count') - 1, 0))
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    get_search_backend().remove(instance.pk)
+
+@receiver(post_save, sender=Post)
+def increment_post_counters(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        UserProfile.objects.filter(user_id=instance.author_id).update(
+            post_count=F('post_count') + 1,
+            last_post_at=instance.created_at,
+        )
+
+@receiver(post_save, sender=Post)
+def update_monthly_stats(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or update_fields is not None and 'updated_at' not in update_fields:
+        return
+    adjust_monthly_stats(instance, 1 if created else 0, instance.updated_at)
+
+@receiver(post_delete, sender=Post)
+def decrement_monthly_stats(sender, instance, **kwargs):
+    adjust_monthly_stats(instance, -1, timezone.now())
+
+@receiver(post_delete, sender=Post)
+def decrement_post_counters(sender, instance, **kwargs):
+    UserProfile.objects.filter(user_id=instance.author_id).update(
+        post_count=Greatest(F('post_count') - 1, 0),
+        last_post_at=post_counter_expressions()['last_post_at'],
+    )
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    bump_generations([
+        GLOBAL_GENERATION,
+        author_generation(instance.author.username),
+        post_generation(instance.pk),
+        month_generation(month_section(instance.created_at)),
+    ])
+
+@receiver(post_save, sender=UserProfile)
+def invalidate_author_pages(sender, instance, **kwargs):
+    bump_generations([author_generation(instance.user.username)])
@@ -0,0 +1,173 @@
+import asyncio
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorPage(Sequence):
+    def __init__(self, object_list, paginator, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    def __init__(self, queryset, per_page, ordering=('-created_at', '-id'), count_limit=None):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.count_limit = count_limit
+
+    def _count_queryset(self):
+        queryset = self.queryset.order_by()
+        if self.count_limit is None:
+            return queryset
+        return queryset[:self.count_limit + 1]
+
+    def _resolve_count(self, count):
+        if self.count_limit is not None and count > self.count_limit:
+            return self.count_limit, True
+        return count, False
+
+    @cached_property
+    def _counted(self):
+        return self._resolve_count(self._count_queryset().count())
+
+    async def acount(self):
+        if '_counted' not in self.__dict__:
+            self.__dict__['_counted'] = self._resolve_count(await self._count_queryset().acount())
+        return self.count
+
+    @property
+    def count(self):
+        return self._counted[0]
+
+    @property
+    def count_is_approximate(self):
+        return self._counted[1]
+
+    def _field_names(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    def _to_python(self, name, value):
+        try:
+            field = self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return value
+        try:
+            return field.to_python(value)
+        except ValidationError:
+            raise InvalidCursor(name)
+
+    def encode_cursor(self, obj, direction):
+        return self.encode_values([getattr(obj, name) for name in self._field_names()], direction)
+
+    def encode_values(self, values, direction='n'):
+        values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+        payload = json.dumps({'d': direction, 'v': values}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, token):
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            direction, values = payload['d'], payload['v']
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise InvalidCursor(token)
+        names = self._field_names()
+        if direction not in ('n', 'p') or not isinstance(values, list) or len(values) != len(names):
+            raise InvalidCursor(token)
+        return [self._to_python(name, value) for name, value in zip(names, values)], direction
+
+    def _keyset_filter(self, values, backwards):
+        condition = Q()
+        names = self._field_names()
+        for index, field in enumerate(self.ordering):
+            descending = field.startswith('-') != backwards
+            clause = Q(**{f'{names[index]}__{"lt" if descending else "gt"}': values[index]})
+            for name, value in zip(names[:index], values[:index]):
+                clause &= Q(**{name: value})
+            condition |= clause
+        return condition
+
+    def _reversed_ordering(self):
+        return [field[1:] if field.startswith('-') else f'-{field}' for field in self.ordering]
+
+    def queryset_after(self, cursor):
+        values, _ = self.decode_cursor(cursor)
+        return self.queryset.order_by(*self.ordering).filter(self._keyset_filter(values, False))
+
+    def _page_queryset(self, cursor):
+        values, direction = None, 'n'
+        if cursor:
+            try:
+                values, direction = self.decode_cursor(cursor)
+            except InvalidCursor:
+                values, direction = None, 'n'
+
+        backwards = direction == 'p'
+        queryset = self.queryset.order_by(*(self._reversed_ordering() if backwards else self.ordering))
+        if values is not None:
+            queryset = queryset.filter(self._keyset_filter(values, backwards))
+        return queryset[:self.per_page + 1], values, backwards
+
+    def _build_page(self, rows, values, backwards):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = self.encode_cursor(rows[-1], 'n')
+        if rows and has_previous:
+            previous_cursor = self.encode_cursor(rows[0], 'p')
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+    def get_page(self, cursor=None):
+        queryset, values, backwards = self._page_queryset(cursor)
+        return self._build_page(list(queryset), values, backwards)
+
+    async def aget_page(self, cursor=None, with_count=False):
+        queryset, values, backwards = self._page_queryset(cursor)
+
+        async def fetch_rows():
+            return [row async for row in queryset]
+
+        if with_count:
+            rows, _ = await asyncio.gather(fetch_rows(), self.acount())
+        else:
+            rows = await fetch_rows()
+        return self._build_page(rows, values, backwards)
@@ -0,0 +1,207 @@
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from itertools import islice
+from operator import itemgetter
+
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from .cache import RELATED_GENERATION, bump_generations, post_generation
+from .models import Post, PostTerm, RelatedPost, RelatedTerm
+
+TOKEN_RE = re.compile(r'[a-z0-9]{3,40}')
+STOP_WORDS = frozenset(
+    'about after also and are because been before being but can could did does for from had has have '
+    'her here his how into its just more most not now only other our out over she should some such '
+    'than that the their them then there these they this those through too under very was were what '
+    'when where which while who why will with would you your'.split()
+)
+TITLE_WEIGHT = 2
+TERMS_PER_POST = 16
+QUERY_TERMS = 8
+POSTINGS_PER_TERM = 64
+RELATED_POSTS = 5
+
+
+def term_counts(title, content):
+    counts = Counter(token for token in TOKEN_RE.findall(content.lower()) if token not in STOP_WORDS)
+    for token in TOKEN_RE.findall(title.lower()):
+        if token not in STOP_WORDS:
+            counts[token] += TITLE_WEIGHT
+    return counts
+
+
+def weigh(counts, idf, default_idf):
+    weights = [(term, (1 + math.log(count)) * idf.get(term, default_idf)) for term, count in counts.items()]
+    top = heapq.nlargest(TERMS_PER_POST, weights, key=itemgetter(1))
+    norm = math.sqrt(sum(weight * weight for _, weight in top)) or 1.0
+    return {term: weight / norm for term, weight in top}
+
+
+def iter_posts(batch_size):
+    return Post.objects.order_by('pk').values_list('pk', 'title', 'content').iterator(chunk_size=batch_size)
+
+
+def insert_rows(model, fields, rows, batch_size):
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = ', '.join(connection.ops.quote_name(model._meta.get_field(field).column) for field in fields)
+    sql = f'INSERT INTO {table} ({columns}) VALUES ({", ".join(["%s"] * len(fields))})'
+    rows = iter(rows)
+    with connection.cursor() as cursor:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return
+            cursor.executemany(sql, batch)
+
+
+def compute_neighbors(vectors, k=RELATED_POSTS, postings_per_term=POSTINGS_PER_TERM, query_terms=QUERY_TERMS):
+    postings = defaultdict(list)
+    for index, (_, vector) in enumerate(vectors):
+        for term, weight in vector.items():
+            postings[term].append((weight, index))
+    for term, entries in postings.items():
+        if len(entries) > postings_per_term:
+            postings[term] = heapq.nlargest(postings_per_term, entries)
+
+    for index, (pk, vector) in enumerate(vectors):
+        scores = defaultdict(float)
+        for term, weight in islice(vector.items(), query_terms):
+            for other_weight, other in postings[term]:
+                if other != index:
+                    scores[other] += weight * other_weight
+        best = heapq.nlargest(k, scores.items(), key=itemgetter(1))
+        yield pk, [(vectors[other][0], score) for other, score in best]
+
+
+def rebuild_related_posts(k=RELATED_POSTS, batch_size=1000):
+    started = timezone.now()
+    document_frequency = Counter()
+    total = 0
+    for _, title, content in iter_posts(batch_size):
+        document_frequency.update(term_counts(title, content).keys())
+        total += 1
+    idf = {term: math.log((1 + total) / (1 + count)) + 1 for term, count in document_frequency.items()}
+    default_idf = math.log(1 + total) + 1
+
+    vectors = [
+        (pk, weigh(term_counts(title, content), idf, default_idf))
+        for pk, title, content in iter_posts(batch_size)
+    ]
+    used_terms = {term for _, vector in vectors for term in vector}
+
+    with transaction.atomic():
+        RelatedPost.objects.all().delete()
+        PostTerm.objects.all().delete()
+        RelatedTerm.objects.all().delete()
+        insert_rows(RelatedTerm, ('term', 'idf'), ((term, idf[term]) for term in sorted(used_terms)), batch_size)
+        insert_rows(
+            PostTerm,
+            ('post', 'term', 'weight'),
+            ((pk, term, weight) for pk, vector in vectors for term, weight in vector.items()),
+            batch_size,
+        )
+        insert_rows(
+            RelatedPost,
+            ('post', 'related', 'score'),
+            (
+                (pk, related_id, score)
+                for pk, neighbors in compute_neighbors(vectors, k)
+                for related_id, score in neighbors
+            ),
+            batch_size,
+        )
+        Post.objects.filter(related_stale=True, updated_at__lt=started).update(related_stale=False)
+        transaction.on_commit(lambda: bump_generations([RELATED_GENERATION]))
+    return total
+
+
+def post_vector(post):
+    counts = term_counts(post.title, post.content)
+    idf = dict(RelatedTerm.objects.filter(term__in=list(counts)).values_list('term', 'idf'))
+    default_idf = RelatedTerm.objects.aggregate(max_idf=Max('idf'))['max_idf'] or 1.0
+    return weigh(counts, idf, default_idf)
+
+
+def nearest_posts(pk, vector, k=RELATED_POSTS):
+    terms = list(islice(vector.items(), QUERY_TERMS))
+    if not terms:
+        return []
+    table = connection.ops.quote_name(PostTerm._meta.db_table)
+    branch = (
+        f'SELECT * FROM (SELECT post_id, weight * %s FROM {table} '
+        f'WHERE term = %s AND post_id != %s ORDER BY weight DESC LIMIT {int(POSTINGS_PER_TERM)})'
+    )
+    params = [value for term, weight in terms for value in (weight, term, pk)]
+    scores = defaultdict(float)
+    with connection.cursor() as cursor:
+        cursor.execute(' UNION ALL '.join([branch] * len(terms)), params)
+        for other, score in cursor.fetchall():
+            scores[other] += score
+    return heapq.nlargest(k, scores.items(), key=itemgetter(1))
+
+
+def update_related_posts(post, k=RELATED_POSTS):
+    vector = post_vector(post)
+    with transaction.atomic():
+        PostTerm.objects.filter(post=post).delete()
+        PostTerm.objects.bulk_create([PostTerm(post=post, term=term, weight=weight) for term, weight in vector.items()])
+        neighbors = nearest_posts(post.pk, vector, k)
+
+        previous = set(RelatedPost.objects.filter(related=post).values_list('post_id', flat=True))
+        RelatedPost.objects.filter(post=post).delete()
+        RelatedPost.objects.filter(related=post).delete()
+        links = [RelatedPost(post=post, related_id=related_id, score=score) for related_id, score in neighbors]
+
+        existing = defaultdict(list)
+        for owner_id, link_pk, score in RelatedPost.objects.filter(
+            post_id__in=[related_id for related_id, _ in neighbors]
+        ).values_list('post_id', 'pk', 'score'):
+            existing[owner_id].append((score, link_pk))
+
+        evicted = []
+        for related_id, score in neighbors:
+            current = existing[related_id]
+            if len(current) >= k:
+                weakest = min(current)
+                if score <= weakest[0]:
+                    continue
+                evicted.append(weakest[1])
+            links.append(RelatedPost(post_id=related_id, related=post, score=score))
+
+        RelatedPost.objects.filter(pk__in=evicted).delete()
+        RelatedPost.objects.bulk_create(links)
+        changed = sorted({post.pk, *previous, *(link.post_id for link in links)})
+        transaction.on_commit(lambda: bump_generations([post_generation(pk) for pk in changed]))
+    return neighbors
+
+
+def refresh_stale_related_posts(k=RELATED_POSTS, batch_size=100):
+    refreshed = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            Post.objects.filter(related_stale=True, pk__gt=last_pk).order_by('pk')
+            .only('pk', 'title', 'content', 'updated_at')[:batch_size]
+        )
+        if not batch:
+            return refreshed
+        for post in batch:
+            update_related_posts(post, k)
+            Post.objects.filter(pk=post.pk, updated_at=post.updated_at).update(related_stale=False)
+        refreshed += len(batch)
+        last_pk = batch[-1].pk
+
+
+def related_links(post, k=RELATED_POSTS):
+    return (
+        RelatedPost.objects.filter(post=post).select_related('related')
+        .only('related', 'related__id', 'related__title', 'related__excerpt', 'related__reading_time')
+        .order_by('-score')[:k]
+    )
+
+
+def related_posts(post, k=RELATED_POSTS):
+    return [link.related for link in related_links(post, k)]
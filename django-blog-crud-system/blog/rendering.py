@@ -0,0 +1,181 @@
+import hashlib
+import html
+import re
+
+try:
+    import markdown
+except ImportError:
+    markdown = None
+
+try:
+    import nh3
+except ImportError:
+    nh3 = None
+
+try:
+    import bleach
+except ImportError:
+    bleach = None
+
+RENDERER_VERSION = 1
+
+ALLOWED_TAGS = {
+    'a', 'blockquote', 'br', 'code', 'em', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'hr', 'li', 'ol', 'p', 'pre', 'strong', 'table', 'tbody', 'td', 'th', 'thead', 'tr', 'ul',
+}
+ALLOWED_ATTRIBUTES = {'a': {'href', 'title'}}
+SAFE_URL_RE = re.compile(r'^(?:https?://|mailto:|/|#)', re.IGNORECASE)
+
+HEADING_RE = re.compile(r'^(#{1,6})\s+(.+?)\s*#*$')
+UNORDERED_RE = re.compile(r'^[-*+]\s+(.*)$')
+ORDERED_RE = re.compile(r'^\d+[.)]\s+(.*)$')
+RULE_RE = re.compile(r'^(?:-{3,}|\*{3,}|_{3,})$')
+CODE_SPAN_RE = re.compile(r'(`+)(.+?)\1')
+LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)\s]+)\)')
+STRONG_RE = re.compile(r'(\*\*|__)(?=\S)(.+?)(?<=\S)\1')
+EMPHASIS_RE = re.compile(r'(?<![\w*])([*_])(?=\S)(.+?)(?<=\S)\1(?![\w*])')
+
+
+def sanitizer_name():
+    if nh3 is not None:
+        return 'nh3'
+    if bleach is not None:
+        return 'bleach'
+    return None
+
+
+def renderer_signature():
+    sanitizer = sanitizer_name()
+    if markdown is not None and sanitizer is not None:
+        return f'markdown-{markdown.__version__}+{sanitizer}:{RENDERER_VERSION}'
+    return f'builtin:{RENDERER_VERSION}'
+
+
+def content_key(content, signature=None):
+    payload = f'{signature or renderer_signature()}\0{content}'
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def render_link(match):
+    text, url = match.group(1), html.unescape(match.group(2))
+    if not SAFE_URL_RE.match(url):
+        return match.group(0)
+    return f'<a href="{html.escape(url)}" rel="nofollow">{text}</a>'
+
+
+def render_inline(text):
+    parts = []
+    for index, chunk in enumerate(CODE_SPAN_RE.split(html.escape(text))):
+        if index % 3 == 2:
+            parts.append(f'<code>{chunk.strip()}</code>')
+        elif index % 3 == 0:
+            chunk = LINK_RE.sub(render_link, chunk)
+            chunk = STRONG_RE.sub(r'<strong>\2</strong>', chunk)
+            parts.append(EMPHASIS_RE.sub(r'<em>\2</em>', chunk))
+    return ''.join(parts)
+
+
+def render_builtin(content):
+    blocks = []
+    paragraph, items, quote = [], [], []
+    list_tag = None
+    lines = content.replace('\r\n', '\n').split('\n')
+
+    def close_paragraph():
+        if paragraph:
+            blocks.append(f'<p>{"<br>".join(render_inline(line) for line in paragraph)}</p>')
+            paragraph.clear()
+
+    def close_list():
+        nonlocal list_tag
+        if items:
+            blocks.append(f'<{list_tag}>{"".join(f"<li>{item}</li>" for item in items)}</{list_tag}>')
+            items.clear()
+        list_tag = None
+
+    def close_quote():
+        if quote:
+            blocks.append(f'<blockquote>{render_builtin(chr(10).join(quote))}</blockquote>')
+            quote.clear()
+
+    def close_all():
+        close_paragraph()
+        close_list()
+        close_quote()
+
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        stripped = line.strip()
+        index += 1
+
+        if stripped.startswith('```'):
+            close_all()
+            code = []
+            while index < len(lines) and not lines[index].strip().startswith('```'):
+                code.append(lines[index])
+                index += 1
+            index += 1
+            blocks.append(f'<pre><code>{html.escape(chr(10).join(code))}</code></pre>')
+            continue
+
+        if stripped.startswith('>'):
+            close_paragraph()
+            close_list()
+            quote.append(stripped[1:].lstrip())
+            continue
+        close_quote()
+
+        if not stripped:
+            close_paragraph()
+            close_list()
+            continue
+
+        heading = HEADING_RE.match(stripped)
+        if heading:
+            close_all()
+            level = len(heading.group(1))
+            blocks.append(f'<h{level}>{render_inline(heading.group(2))}</h{level}>')
+            continue
+
+        if RULE_RE.match(stripped):
+            close_all()
+            blocks.append('<hr>')
+            continue
+
+        for pattern, tag in ((UNORDERED_RE, 'ul'), (ORDERED_RE, 'ol')):
+            item = pattern.match(stripped)
+            if item:
+                close_paragraph()
+                if list_tag != tag:
+                    close_list()
+                    list_tag = tag
+                items.append(render_inline(item.group(1)))
+                break
+        else:
+            close_list()
+            paragraph.append(stripped)
+
+    close_all()
+    return '\n'.join(blocks)
+
+
+def sanitize(rendered):
+    if nh3 is not None:
+        return nh3.clean(rendered, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES, link_rel='nofollow')
+    return bleach.clean(rendered, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES, strip=True)
+
+
+def render_markdown(content):
+    if markdown is not None and sanitizer_name() is not None:
+        return sanitize(markdown.markdown(content, extensions=['fenced_code', 'tables']))
+    return render_builtin(content)
+
+
+def render_rows(rows, signature):
+    rendered = []
+    for pk, content, current_key in rows:
+        key = content_key(content, signature)
+        if key != current_key:
+            rendered.append((pk, key, render_markdown(content)))
+    return rendered
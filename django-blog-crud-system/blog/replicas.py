@@ -0,0 +1,102 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PRIMARY_UNTIL_SESSION_KEY = 'blog_primary_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+replica_reads_enabled = ContextVar('replica_reads_enabled', default=False)
+
+
+def replica_aliases():
+    return list(getattr(settings, 'BLOG_REPLICA_DATABASES', []))
+
+
+def is_pinned_to_primary(request):
+    session = getattr(request, 'session', None)
+    if session is None:
+        return False
+    return session.get(PRIMARY_UNTIL_SESSION_KEY, 0) > time.time()
+
+
+def pin_to_primary(request):
+    seconds = getattr(settings, 'BLOG_REPLICA_STICKY_SECONDS', 15)
+    request.session[PRIMARY_UNTIL_SESSION_KEY] = time.time() + seconds
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if not replicas or not replica_reads_enabled.get():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
+
+
+@contextmanager
+def reads_from(replica):
+    token = replica_reads_enabled.set(replica)
+    try:
+        yield
+    finally:
+        replica_reads_enabled.reset(token)
+
+
+def primary_reads():
+    return reads_from(False)
+
+
+def replica_reads(view_func):
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            pinned = await sync_to_async(is_pinned_to_primary)(request)
+            with reads_from(bool(replica_aliases()) and not pinned):
+                return await view_func(request, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not replica_aliases() or is_pinned_to_primary(request):
+            return view_func(request, *args, **kwargs)
+        with reads_from(True):
+            return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+class PrimaryStickinessMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and replica_aliases() and hasattr(request, 'session'):
+            pin_to_primary(request)
+        return response
+
+
+def sync_sqlite_replica(target, source=DEFAULT_DB_ALIAS):
+    source_connection, target_connection = connections[source], connections[target]
+    if source_connection.vendor != 'sqlite' or target_connection.vendor != 'sqlite':
+        raise ImproperlyConfigured('Replica syncing is only supported between SQLite databases')
+    source_connection.ensure_connection()
+    target_connection.ensure_connection()
+    source_connection.connection.backup(target_connection.connection)
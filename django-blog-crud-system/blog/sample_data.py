@@ -0,0 +1,124 @@
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from .models import Post, UserProfile, reconcile_monthly_stats, reconcile_post_counters
+from .search import get_search_backend
+
+DEMO_PASSWORD = 'demo123456'
+
+TITLE_WORDS = (
+    'introduction guide building understanding modern best practices essentials '
+    'comparison basics deep dive scaling testing securing deploying debugging '
+    'django python rest api database css javascript devops cloud security '
+    'machine learning authentication caching performance architecture'
+).split()
+
+VOCABULARY = (
+    'this is a comprehensive guide exploring the fundamental concepts and advanced techniques '
+    'learn how to build scalable applications with clean architecture best practices '
+    'discover powerful features capabilities that make development efficient maintainable '
+    'post covers everything from basics patterns deep dive into professional practices '
+    'will elevate your coding skills real world examples practical demonstrations included '
+    'explore modern approaches building robust secure step by instructions code '
+    'detailed walkthrough implementing industry standard solutions projects experienced '
+    'developers avoid common pitfalls django python database index query search cache '
+    'server request response template model view form admin migration signal queryset '
+    'paginator cursor latency throughput benchmark profile session token deploy cloud security'
+).split()
+
+CONTENT_SIZES = {
+    'short': lambda rng: rng.randint(20, 80),
+    'uniform': lambda rng: rng.randint(50, 400),
+    'lognormal': lambda rng: min(50000, max(20, int(rng.lognormvariate(5, 1.2)))),
+}
+
+
+@contextmanager
+def explicit_timestamps():
+    fields = [Post._meta.get_field('created_at'), Post._meta.get_field('updated_at')]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class SampleDataGenerator:
+    def __init__(self, seed=0, content_size='uniform', days=365):
+        self.rng = random.Random(seed)
+        self.content_size = CONTENT_SIZES[content_size]
+        self.days = days
+
+    def author_names(self, count):
+        return ['demo'] + [f'author_{index:05d}' for index in range(1, count)]
+
+    def ensure_authors(self, count, batch_size=1000):
+        names = self.author_names(count)
+        existing = set(User.objects.filter(username__in=names).values_list('username', flat=True))
+        password = make_password(DEMO_PASSWORD)
+        User.objects.bulk_create([
+            User(username=name, email=f'{name}@example.com', password=password)
+            for name in names if name not in existing
+        ], batch_size=batch_size)
+        pks = dict(User.objects.filter(username__in=names).values_list('username', 'pk'))
+        author_ids = [pks[name] for name in names]
+        with_profile = set(UserProfile.objects.filter(user_id__in=author_ids).values_list('user_id', flat=True))
+        UserProfile.objects.bulk_create([
+            UserProfile(user_id=author_id) for author_id in author_ids if author_id not in with_profile
+        ], batch_size=batch_size)
+        return author_ids
+
+    def make_title(self):
+        return ' '.join(self.rng.sample(TITLE_WORDS, self.rng.randint(3, 6))).title()
+
+    def make_content(self):
+        words = self.rng.choices(VOCABULARY, k=self.content_size(self.rng))
+        sentences = []
+        for start in range(0, len(words), 12):
+            sentence = ' '.join(words[start:start + 12])
+            sentences.append(sentence[0].upper() + sentence[1:] + '.')
+        return ' '.join(sentences)
+
+    def make_post(self, author_id, now):
+        created_at = now - timedelta(seconds=self.rng.randint(0, self.days * 86400))
+        post = Post(
+            title=self.make_title(),
+            content=self.make_content(),
+            author_id=author_id,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+        post.update_derived_fields()
+        return post
+
+    def generate(self, posts, authors=1, batch_size=1000, rebuild_index=True, progress=None):
+        author_ids = self.ensure_authors(authors, batch_size)
+        weights = [1 / rank for rank in range(1, len(author_ids) + 1)]
+        now = timezone.now()
+        created = 0
+        with explicit_timestamps():
+            while created < posts:
+                count = min(batch_size, posts - created)
+                batch_authors = self.rng.choices(author_ids, weights=weights, k=count)
+                with transaction.atomic():
+                    Post.objects.bulk_create(
+                        [self.make_post(author_id, now) for author_id in batch_authors],
+                        batch_size=batch_size,
+                    )
+                created += count
+                if progress:
+                    progress(created)
+
+        reconcile_post_counters(UserProfile.objects.filter(user_id__in=author_ids), batch_size=batch_size)
+        reconcile_monthly_stats()
+        if rebuild_index:
+            get_search_backend().rebuild(Post.objects.all(), batch_size=batch_size)
+        return created
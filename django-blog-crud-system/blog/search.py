@@ -0,0 +1,112 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Q, Value, FloatField
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+FTS_TABLE = 'blog_post_fts'
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class BaseSearchBackend:
+    def index(self, post):
+        raise NotImplementedError
+
+    def remove(self, post_id):
+        raise NotImplementedError
+
+    def rebuild(self, queryset, batch_size=1000):
+        raise NotImplementedError
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+
+class ContainsSearchBackend(BaseSearchBackend):
+    def index(self, post):
+        pass
+
+    def remove(self, post_id):
+        pass
+
+    def rebuild(self, queryset, batch_size=1000):
+        return 0
+
+    def search(self, queryset, query):
+        return queryset.filter(
+            Q(title__icontains=query) |
+            Q(content__icontains=query) |
+            Q(author__username__icontains=query)
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    title_weight = 10.0
+    content_weight = 1.0
+    author_weight = 5.0
+
+    def _connection(self, model=None):
+        from .models import Post
+        return connections[router.db_for_write(model or Post)]
+
+    def build_match(self, query):
+        tokens = TOKEN_RE.findall(query.lower())
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def index(self, post):
+        with self._connection().cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, content, author) VALUES (%s, %s, %s, %s)',
+                [post.pk, post.title, post.content, post.author.username]
+            )
+
+    def remove(self, post_id):
+        with self._connection().cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id])
+
+    def rebuild(self, queryset, batch_size=1000):
+        rows = queryset.order_by().values_list('id', 'title', 'content', 'author__username')
+        connection = self._connection(queryset.model)
+        indexed = 0
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            batch = []
+            for row in rows.iterator(chunk_size=batch_size):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    self._insert_batch(cursor, batch)
+                    indexed += len(batch)
+                    batch = []
+            if batch:
+                self._insert_batch(cursor, batch)
+                indexed += len(batch)
+            cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        return indexed
+
+    def _insert_batch(self, cursor, batch):
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, content, author) VALUES (%s, %s, %s, %s)',
+            batch
+        )
+
+    def search(self, queryset, query):
+        match = self.build_match(query)
+        if not match:
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+        table = queryset.model._meta.db_table
+        rank_sql = f'bm25({FTS_TABLE}, {self.title_weight}, {self.content_weight}, {self.author_weight})'
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = {table}.id', f'{FTS_TABLE} MATCH %s'],
+            params=[match],
+        ).annotate(search_rank=RawSQL(rank_sql, (), output_field=FloatField()))
+
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    backend_path = getattr(settings, 'BLOG_SEARCH_BACKEND', 'blog.search.SQLiteFTSBackend')
+    return import_string(backend_path)()
@@ -0,0 +1,55 @@
+import re
+from datetime import datetime
+
+from django.contrib.sitemaps import Sitemap
+from django.utils import timezone
+from .models import Post, PostMonthlyStats
+
+SECTION_RE = re.compile(r'^(\d{4})-(0[1-9]|1[0-2])$')
+
+
+def parse_section(section):
+    match = SECTION_RE.match(section)
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def aware_bounds(start, end):
+    if timezone.is_naive(timezone.now()):
+        return start, end
+    return timezone.make_aware(start), timezone.make_aware(end)
+
+
+def month_bounds(year, month):
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return aware_bounds(datetime(year, month, 1), end)
+
+
+def year_bounds(year):
+    return aware_bounds(datetime(year, 1, 1), datetime(year + 1, 1, 1))
+
+
+def post_month_sections():
+    rows = PostMonthlyStats.objects.months().order_by('month').values_list('month', 'post_count', 'last_modified')
+    return [(f'{month:%Y-%m}', total, lastmod) for month, total, lastmod in rows]
+
+
+class MonthlyPostSitemap(Sitemap):
+    changefreq = 'weekly'
+    priority = 0.6
+
+    def __init__(self, year, month):
+        self.year = year
+        self.month = month
+
+    def items(self):
+        start, end = month_bounds(self.year, self.month)
+        return (
+            Post.objects.filter(created_at__gte=start, created_at__lt=end)
+            .only('id', 'updated_at')
+            .order_by('created_at', 'id')
+        )
+
+    def lastmod(self, item):
+        return item.updated_at
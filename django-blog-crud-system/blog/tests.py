@@ -1 +1,1037 @@
-from django.test import TestCase
+import json
+from collections import Counter
+import tempfile
+from importlib import import_module
+from io import StringIO
+from datetime import timedelta
+from types import SimpleNamespace
+from asgiref.sync import async_to_sync, sync_to_async
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.test.utils import CaptureQueriesContext
+from django.test import TestCase, TransactionTestCase, Client, RequestFactory, override_settings
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from .models import (
+    Post, PostMonthlyStats, PostWeeklyViews, RelatedPost, Tag, UserProfile,
+    recent_post_count_expression, reconcile_monthly_stats, reconcile_post_counters, reconcile_tag_counters,
+)
+from .search import get_search_backend
+from .pagination import CursorPaginator
+from .cache import get_stats
+from .conditional import listing_probe
+from .sample_data import SampleDataGenerator, explicit_timestamps
+from .middleware import RequestInstrumentationMiddleware, fingerprint
+from .benchmarking import compare_to_baseline, percentile
+from .rendering import content_key
+from .related import rebuild_related_posts, refresh_stale_related_posts, related_posts
+from .replicas import ReplicaRouter, sync_sqlite_replica
+from .view_counts import current_week, most_viewed, view_counter, write_view_counts
+
+
+class PostSearchTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='writer', password='testpass123')
+        self.django_post = Post.objects.create(
+            title='Django Deployment Guide',
+            content='Deploying applications with gunicorn and nginx in production.',
+            author=self.user
+        )
+        self.python_post = Post.objects.create(
+            title='Python Tips',
+            content='Small tricks that make django projects easier to maintain.',
+            author=self.user
+        )
+
+    def test_search_ranks_title_matches_first(self):
+        response = self.client.get(reverse('home'), {'search': 'django'})
+        self.assertEqual(list(response.context['page_obj']), [self.django_post, self.python_post])
+
+    def test_search_matches_prefixes_and_author(self):
+        results = get_search_backend().search(Post.objects.all(), 'deploy')
+        self.assertEqual(list(results), [self.django_post])
+        self.assertEqual(get_search_backend().search(Post.objects.all(), 'writ').count(), 2)
+
+    def test_index_follows_save_and_delete(self):
+        self.python_post.title = 'Kubernetes Tips'
+        self.python_post.save()
+        self.assertEqual(get_search_backend().search(Post.objects.all(), 'kubernetes').count(), 1)
+        self.python_post.delete()
+        self.assertEqual(get_search_backend().search(Post.objects.all(), 'kubernetes').count(), 0)
+
+    def test_rebuild_index(self):
+        Post.objects.bulk_create([
+            Post(title='Bulk Loaded Post', content='Imported without signals.', author=self.user)
+        ])
+        backend = get_search_backend()
+        self.assertEqual(backend.search(Post.objects.all(), 'imported').count(), 0)
+        self.assertEqual(backend.rebuild(Post.objects.all()), 3)
+        self.assertEqual(backend.search(Post.objects.all(), 'imported').count(), 1)
+
+    def test_relevance_results_paginate_with_cursor(self):
+        for i in range(6):
+            Post.objects.create(title=f'Django note {i}', content='Another django write-up.', author=self.user)
+        first = self.client.get(reverse('home'), {'search': 'django'}).context['page_obj']
+        second = self.client.get(reverse('home'), {'search': 'django', 'page': first.next_cursor}).context['page_obj']
+        self.assertEqual(len(first) + len(second), 8)
+        self.assertFalse(set(first) & set(second))
+
+    def test_search_without_tokens_returns_nothing(self):
+        response = self.client.get(reverse('home'), {'search': '!!!'})
+        self.assertEqual(list(response.context['page_obj']), [])
+
+
+class CursorPaginatorTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='pager', password='testpass123')
+        for i in range(14):
+            Post.objects.create(title=f'Post number {i:02d}', content='Paginated content body.', author=self.user)
+
+    def test_walks_forward_and_back(self):
+        paginator = CursorPaginator(Post.objects.all(), 6)
+        first = paginator.get_page()
+        second = paginator.get_page(first.next_cursor)
+        third = paginator.get_page(second.next_cursor)
+        self.assertFalse(first.has_previous())
+        self.assertFalse(third.has_next())
+        self.assertEqual(len(third), 2)
+        seen = [post.pk for page in (first, second, third) for post in page]
+        self.assertEqual(seen, list(Post.objects.order_by('-created_at', '-id').values_list('pk', flat=True)))
+        back = paginator.get_page(third.previous_cursor)
+        self.assertEqual(list(back), list(second))
+        self.assertEqual(list(paginator.get_page(back.previous_cursor)), list(first))
+
+    def test_title_ordering_and_constant_queries(self):
+        paginator = CursorPaginator(Post.objects.all(), 6, ordering=('title', 'id'))
+        page = paginator.get_page()
+        with self.assertNumQueries(1):
+            page = paginator.get_page(page.next_cursor)
+        self.assertEqual(page[0].title, 'Post number 06')
+
+    def test_invalid_cursor_returns_first_page(self):
+        paginator = CursorPaginator(Post.objects.all(), 6)
+        self.assertEqual(list(paginator.get_page('not-a-cursor')), list(paginator.get_page()))
+
+    def test_approximate_count(self):
+        paginator = CursorPaginator(Post.objects.all(), 6, count_limit=10)
+        self.assertEqual(paginator.count, 10)
+        self.assertTrue(paginator.count_is_approximate)
+        self.assertFalse(CursorPaginator(Post.objects.all(), 6, count_limit=100).count_is_approximate)
+
+    def test_home_links_keep_search_and_sort(self):
+        response = self.client.get(reverse('home'), {'sort': 'oldest'})
+        next_cursor = response.context['page_obj'].next_cursor
+        self.assertContains(response, f'sort=oldest&amp;page={next_cursor}')
+        response = self.client.get(reverse('home'), {'sort': 'oldest', 'page': next_cursor})
+        self.assertEqual(response.context['page_obj'][0].title, 'Post number 06')
+
+
+class PostCounterTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='counter', password='testpass123')
+
+    def profile(self):
+        return UserProfile.objects.get(user=self.user)
+
+    def test_counters_follow_create_and_delete(self):
+        first = Post.objects.create(title='First counted post', content='Counting content body.', author=self.user)
+        second = Post.objects.create(title='Second counted post', content='Counting content body.', author=self.user)
+        profile = self.profile()
+        self.assertEqual((profile.post_count, profile.posts_this_week), (2, 2))
+        self.assertEqual(profile.last_post_at, second.created_at)
+        second.delete()
+        profile = self.profile()
+        self.assertEqual((profile.post_count, profile.posts_this_week), (1, 1))
+        self.assertEqual(profile.last_post_at, first.created_at)
+        first.delete()
+        self.assertIsNone(self.profile().last_post_at)
+
+    def test_reconcile_repairs_drift(self):
+        Post.objects.create(title='Counted post one', content='Counting content body.', author=self.user)
+        old = Post.objects.create(title='Counted post two', content='Counting content body.', author=self.user)
+        Post.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=30))
+        UserProfile.objects.filter(user=self.user).update(post_count=9)
+        self.assertEqual(reconcile_post_counters(dry_run=True), 1)
+        self.assertEqual(self.profile().post_count, 9)
+        self.assertEqual(reconcile_post_counters(), 1)
+        profile = self.profile()
+        self.assertEqual((profile.post_count, profile.posts_this_week), (2, 1))
+        self.assertEqual(reconcile_post_counters(), 0)
+
+    def test_posts_this_week_is_a_rolling_window(self):
+        now = timezone.now()
+        for days in (18, 12, 6, 0):
+            post = Post.objects.create(title=f'Post {days} days ago', content='Counting content body.', author=self.user)
+            Post.objects.filter(pk=post.pk).update(created_at=now - timedelta(days=days))
+        self.assertEqual(self.profile().posts_this_week, 2)
+        profile = UserProfile.objects.annotate(recent=recent_post_count_expression()).get(user=self.user)
+        self.assertEqual(profile.recent, 2)
+
+    def test_login_does_not_touch_profile(self):
+        Post.objects.create(title='Counted post', content='Counting content body.', author=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(reverse('login'), {'username': 'counter', 'password': 'testpass123'})
+        self.assertFalse(any('blog_userprofile' in query['sql'] for query in queries))
+        self.assertEqual(self.profile().post_count, 1)
+
+    def test_user_save_writes_only_dirty_profile_fields(self):
+        user = User.objects.select_related('profile').get(pk=self.user.pk)
+        Post.objects.create(title='Counted post', content='Counting content body.', author=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+        self.assertFalse(any('UPDATE "blog_userprofile"' in query['sql'] for query in queries))
+        user.profile.bio = 'Writes about counters.'
+        user.save()
+        profile = self.profile()
+        self.assertEqual((profile.bio, profile.post_count), ('Writes about counters.', 1))
+
+    def test_profile_admin_avoids_per_row_counts(self):
+        for i in range(3):
+            User.objects.create_user(username=f'admin_row_{i}')
+        admin_user = User.objects.create_superuser(username='admin', password='testpass123')
+        self.client.force_login(admin_user)
+        url = reverse('admin:blog_userprofile_changelist')
+        self.client.get(url)
+        with self.assertNumQueries(5):
+            self.client.get(url)
+
+
+class DashboardTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='author', password='testpass123')
+        self.client.force_login(self.user)
+
+    def create_posts(self, count):
+        Post.objects.bulk_create([
+            Post(title=f'Dashboard post {i}', content='Dashboard content body.', author=self.user)
+            for i in range(count)
+        ])
+
+    def test_stats(self):
+        self.create_posts(8)
+        Post.objects.filter(title='Dashboard post 0').update(created_at=timezone.now() - timedelta(days=10))
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.context['total_posts'], 8)
+        self.assertEqual(response.context['posts_this_week'], 7)
+        self.assertEqual(response.context['recent_activity'], 5)
+        self.assertEqual(len(response.context['page_obj']), 6)
+
+    def test_constant_queries_regardless_of_post_volume(self):
+        for count in (3, 40):
+            self.create_posts(count)
+            with self.assertNumQueries(4):
+                response = self.client.get(reverse('dashboard'))
+            self.assertEqual(response.status_code, 200)
+
+
+@override_settings(BLOG_PAGE_CACHE_ENABLED=True)
+class PageCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='cached', password='testpass123')
+        self.post = Post.objects.create(title='Cached post title', content='Cached content body.', author=self.user)
+
+    def test_anonymous_hit_after_miss(self):
+        self.assertEqual(self.client.get(reverse('home'))['X-Blog-Cache'], 'miss')
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('home'))
+        self.assertEqual(response['X-Blog-Cache'], 'hit')
+        self.assertContains(response, 'Cached post title')
+
+    def test_save_invalidates_affected_pages(self):
+        detail = reverse('post_detail', kwargs={'pk': self.post.pk})
+        author = reverse('author_posts', kwargs={'username': 'cached'})
+        for url in (reverse('home'), detail, author):
+            self.client.get(url)
+        self.post.title = 'Renamed cached post'
+        self.post.save()
+        for url in (reverse('home'), detail, author):
+            response = self.client.get(url)
+            self.assertEqual(response['X-Blog-Cache'], 'miss')
+            self.assertContains(response, 'Renamed cached post')
+
+    def test_other_authors_stay_cached(self):
+        other = User.objects.create_user(username='other', password='testpass123')
+        author = reverse('author_posts', kwargs={'username': 'cached'})
+        self.client.get(author)
+        Post.objects.create(title='Unrelated new post', content='Unrelated content body.', author=other)
+        self.assertEqual(self.client.get(author)['X-Blog-Cache'], 'hit')
+
+    def test_authenticated_and_unknown_params_bypass_cache(self):
+        self.assertFalse(self.client.get(reverse('home'), {'utm_source': 'feed'}).has_header('X-Blog-Cache'))
+        self.client.force_login(self.user)
+        self.assertFalse(self.client.get(reverse('home')).has_header('X-Blog-Cache'))
+
+    def test_stats(self):
+        self.client.get(reverse('home'))
+        self.client.get(reverse('home'))
+        self.assertEqual(get_stats(['home'])['home'], {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+    def test_file_based_backend(self):
+        with tempfile.TemporaryDirectory() as location:
+            caches_setting = {'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': location,
+            }}
+            with self.settings(CACHES=caches_setting):
+                self.assertEqual(self.client.get(reverse('home'))['X-Blog-Cache'], 'miss')
+                self.assertEqual(self.client.get(reverse('home'))['X-Blog-Cache'], 'hit')
+                Post.objects.create(title='Fresh file cached post', content='Cached content body.', author=self.user)
+                self.assertContains(self.client.get(reverse('home')), 'Fresh file cached post')
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='etag', password='testpass123')
+        self.post = Post.objects.create(title='Validated post', content='Conditional content body.', author=self.user)
+
+    def assert_revalidates(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        headers = {'HTTP_IF_NONE_MATCH': response['ETag']}
+        with self.assertTemplateNotUsed('base.html'):
+            self.assertEqual(self.client.get(url, **headers).status_code, 304)
+        return headers
+
+    def test_post_detail_not_modified(self):
+        url = reverse('post_detail', kwargs={'pk': self.post.pk})
+        self.assertIn('Last-Modified', self.client.get(url))
+        headers = self.assert_revalidates(url)
+        Post.objects.filter(pk=self.post.pk).update(updated_at=timezone.now() + timedelta(seconds=1))
+        self.assertEqual(self.client.get(url, **headers).status_code, 200)
+
+    def test_listings_not_modified_until_posts_change(self):
+        home = reverse('home')
+        author = reverse('author_posts', kwargs={'username': 'etag'})
+        home_headers = self.assert_revalidates(home)
+        author_headers = self.assert_revalidates(author)
+        Post.objects.create(title='Another validated post', content='Conditional content body.', author=self.user)
+        self.assertEqual(self.client.get(home, **home_headers).status_code, 200)
+        self.assertEqual(self.client.get(author, **author_headers).status_code, 200)
+
+    def test_etag_varies_with_user_and_params(self):
+        url = reverse('home')
+        anonymous = self.client.get(url)['ETag']
+        self.assertNotEqual(self.client.get(url, {'sort': 'title'})['ETag'], anonymous)
+        self.client.force_login(self.user)
+        self.assertNotEqual(self.client.get(url)['ETag'], anonymous)
+
+    def test_listing_probe_uses_covering_index(self):
+        for username in (None, 'etag'):
+            request = RequestFactory().get('/')
+            with CaptureQueriesContext(connection) as queries:
+                listing_probe(request, username)
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {queries[-1]['sql']}")
+                plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+            self.assertIn('COVERING INDEX blog_post_', plan)
+
+
+class PostExcerptTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='excerpt', password='testpass123')
+
+    def test_derived_fields_computed_on_save(self):
+        post = Post.objects.create(title='Long form post', content=' '.join(['word'] * 450), author=self.user)
+        self.assertEqual(post.excerpt, ' '.join(['word'] * 20) + '…')
+        self.assertEqual((post.word_count, post.reading_time), (450, 3))
+        post.content = 'Now a much shorter body.'
+        post.save(update_fields=['content'])
+        post.refresh_from_db()
+        self.assertEqual((post.excerpt, post.word_count, post.reading_time), ('Now a much shorter body.', 5, 1))
+
+    def test_list_pages_skip_bodies_and_author_lookups(self):
+        for i in range(6):
+            author = User.objects.create_user(username=f'card_author_{i}')
+            Post.objects.create(title=f'Card post {i}', content='Body ' * 1000, author=author)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('home'))
+        self.assertContains(response, 'card_author_5')
+        self.assertFalse(any('"blog_post"."content"' in query['sql'] for query in queries))
+        self.assertEqual(len(queries), 4)
+
+
+class SampleDataGeneratorTest(TestCase):
+    def test_generates_posts_across_authors(self):
+        created = SampleDataGenerator(seed=7).generate(120, authors=5, batch_size=50)
+        self.assertEqual(created, 120)
+        self.assertEqual(Post.objects.values('author').distinct().count(), 5)
+        self.assertEqual(
+            sum(UserProfile.objects.values_list('post_count', flat=True)), 120
+        )
+        self.assertFalse(Post.objects.filter(excerpt='').exists())
+        self.assertGreater(Post.objects.values('created_at').distinct().count(), 100)
+        self.assertTrue(get_search_backend().search(Post.objects.all(), 'django').exists())
+        self.assertEqual(sum(PostMonthlyStats.objects.for_author().values_list('post_count', flat=True)), 120)
+
+    def test_demo_author_is_most_active(self):
+        User.objects.create_user(username='author_00001', password='testpass123')
+        generator = SampleDataGenerator(seed=7)
+        author_ids = generator.ensure_authors(3)
+        self.assertEqual(User.objects.get(pk=author_ids[0]).username, 'demo')
+        generator.generate(200, authors=3, batch_size=50)
+        counts = Counter(Post.objects.values_list('author__username', flat=True))
+        self.assertEqual(counts.most_common(1)[0][0], 'demo')
+
+    def test_seed_is_deterministic(self):
+        first, second = SampleDataGenerator(seed=3), SampleDataGenerator(seed=3)
+        self.assertEqual(
+            [(first.make_title(), first.make_content()) for _ in range(5)],
+            [(second.make_title(), second.make_content()) for _ in range(5)],
+        )
+
+
+class RequestInstrumentationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='timed', password='testpass123')
+        Post.objects.create(title='Timed post title', content='Timed content body.', author=self.user)
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('home'))
+        timing = response['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn('desc="4 queries"', timing)
+        self.assertIn('tpl;dur=', timing)
+
+    def test_flags_repeated_queries(self):
+        def view(request):
+            for post in Post.objects.all():
+                for _ in range(5):
+                    User.objects.get(pk=post.author_id)
+            return HttpResponse('ok')
+
+        with self.settings(INSTRUMENTATION_LOG_JSON=True):
+            middleware = RequestInstrumentationMiddleware(view)
+            with self.assertLogs('blog.instrumentation', level='INFO') as logs:
+                response = middleware(RequestFactory().get('/cards/'))
+        self.assertIn('dup;desc="5 repeated queries"', response['Server-Timing'])
+        self.assertIn('Possible N+1 query on /cards/: 5 x SELECT', logs.output[0])
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record['queries'], 6)
+        self.assertEqual(len(record['n_plus_one']), 1)
+        self.assertIn('"auth_user"', record['n_plus_one'][0])
+
+    def test_fingerprint_collapses_in_lists(self):
+        self.assertEqual(fingerprint('SELECT *\n FROM t WHERE id IN (%s, %s, %s)'), 'SELECT * FROM t WHERE id IN (...)')
+
+
+class BenchmarkingTest(TestCase):
+    def setUp(self):
+        self.baseline = {'home': {'status': 200, 'p50_ms': 10.0, 'p95_ms': 20.0, 'p99_ms': 30.0, 'queries': 4, 'peak_kb': 100.0}}
+
+    def result(self, **overrides):
+        return {'home': {**self.baseline['home'], **overrides}}
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 51)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_within_tolerance_passes(self):
+        self.assertEqual(compare_to_baseline(self.result(p50_ms=14.0, p99_ms=90.0, queries=3), self.baseline), [])
+
+    def test_regressions_fail(self):
+        regressions = compare_to_baseline(
+            self.result(queries=5, p95_ms=40.0, peak_kb=200.0, status=500), self.baseline
+        )
+        self.assertEqual(len(regressions), 4)
+        self.assertIn('home: 5 queries (baseline 4)', regressions)
+
+
+@override_settings(ROOT_URLCONF='blog.async_urls')
+class AsyncViewsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='async_author', password='testpass123')
+        for i in range(8):
+            Post.objects.create(title=f'Async post {i}', content='Async content body.', author=self.user)
+
+    async def test_home_fetches_page_and_count(self):
+        response = await self.async_client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['page_obj']), 6)
+        self.assertEqual(response.context['page_obj'].paginator.count, 8)
+        next_page = await self.async_client.get(reverse('home'), {'page': response.context['page_obj'].next_cursor})
+        self.assertEqual(len(next_page.context['page_obj']), 2)
+
+    async def test_search(self):
+        response = await self.async_client.get(reverse('home'), {'search': 'async 3'})
+        self.assertEqual([post.title for post in response.context['page_obj']], ['Async post 3'])
+
+    async def test_post_detail_and_author_posts(self):
+        post = await Post.objects.afirst()
+        response = await self.async_client.get(reverse('post_detail', kwargs={'pk': post.pk}))
+        self.assertContains(response, post.title)
+        response = await self.async_client.get(reverse('author_posts', kwargs={'username': 'async_author'}))
+        self.assertEqual(response.context['total_posts'], 8)
+        self.assertIn('Server-Timing', response)
+
+    async def test_missing_objects_return_404(self):
+        response = await self.async_client.get(reverse('post_detail', kwargs={'pk': 999999}))
+        self.assertEqual(response.status_code, 404)
+        response = await self.async_client.get(reverse('author_posts', kwargs={'username': 'nobody'}))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_authenticated_user_is_resolved(self):
+        await sync_to_async(self.async_client.force_login)(self.user)
+        response = await self.async_client.get(reverse('home'))
+        self.assertContains(response, 'async_author')
+
+    async def test_search_keeps_tag_cloud(self):
+        post = await Post.objects.afirst()
+        await sync_to_async(post.set_tags)('async')
+        response = await self.async_client.get(reverse('home'), {'search': 'async'})
+        self.assertEqual([tag.slug for tag in response.context['tag_cloud']], ['async'])
+        self.assertEqual([tag.slug for tag in response.context['tag_facets']], ['async'])
+
+    async def test_post_detail_revalidates_and_caches(self):
+        post = await Post.objects.afirst()
+        url = reverse('post_detail', kwargs={'pk': post.pk})
+        await sync_to_async(cache.clear)()
+        view_counter.drain()
+        with override_settings(BLOG_PAGE_CACHE_ENABLED=True, BLOG_VIEW_COUNT_FLUSH_THRESHOLD=1):
+            response = await self.async_client.get(url)
+            self.assertEqual(response['X-Blog-Cache'], 'miss')
+            self.assertEqual((await self.async_client.get(url))['X-Blog-Cache'], 'hit')
+            response = await self.async_client.get(url, headers={'If-None-Match': response['ETag']})
+            self.assertEqual(response.status_code, 304)
+        views = await PostWeeklyViews.objects.filter(post=post).values_list('views', flat=True).afirst()
+        self.assertEqual(views, 3)
+
+
+class ExportTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='exporter', password='testpass123')
+        self.other = User.objects.create_user(username='someone', password='testpass123')
+        self.posts = [
+            Post.objects.create(title=f'Exported post {i}', content='Exported content body.', author=self.user)
+            for i in range(3)
+        ]
+        Post.objects.create(title='Other author post', content='Exported content body.', author=self.other)
+
+    def read_ndjson(self, response):
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content).decode()
+        return [json.loads(line) for line in body.splitlines()]
+
+    def test_ndjson_export_filtered_by_author(self):
+        response = self.client.get(reverse('export_posts'), {'author': 'exporter'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        records = self.read_ndjson(response)
+        self.assertEqual([record['id'] for record in records], [post.pk for post in self.posts])
+        self.assertEqual(records[0]['author'], 'exporter')
+
+    def test_incremental_export_with_since_cursor(self):
+        records = self.read_ndjson(self.client.get(reverse('export_posts')))
+        cursor = records[-1]['cursor']
+        self.assertEqual(self.read_ndjson(self.client.get(reverse('export_posts'), {'since': cursor})), [])
+        self.posts[0].title = 'Edited exported post'
+        self.posts[0].save()
+        changed = self.read_ndjson(self.client.get(reverse('export_posts'), {'since': cursor}))
+        self.assertEqual([record['title'] for record in changed], ['Edited exported post'])
+
+    def test_json_export_and_date_range(self):
+        Post.objects.filter(pk=self.posts[0].pk).update(created_at=timezone.now() - timedelta(days=40))
+        start = (timezone.now() - timedelta(days=1)).date().isoformat()
+        response = self.client.get(reverse('export_posts'), {'format': 'json', 'start': start})
+        payload = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(len(payload['posts']), 3)
+        self.assertEqual(payload['next_since'], payload['posts'][-1]['cursor'])
+
+    def test_invalid_parameters(self):
+        for params in ({'format': 'xml'}, {'since': 'garbage'}, {'start': '2024-13-01'}, {'author': 'nobody'}):
+            self.assertEqual(self.client.get(reverse('export_posts'), params).status_code, 400)
+
+    def test_management_command(self):
+        output = StringIO()
+        call_command('export_posts', author='someone', stdout=output)
+        self.assertEqual(json.loads(output.getvalue())['title'], 'Other author post')
+
+
+class FeedAndSitemapTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='syndicated', password='testpass123')
+        self.other = User.objects.create_user(username='quiet', password='testpass123')
+        self.post = Post.objects.create(title='Syndicated post', content='Feed content body.', author=self.user)
+        self.old_post = Post.objects.create(title='Archived post', content='Old content body.', author=self.user)
+        Post.objects.filter(pk=self.old_post.pk).update(created_at=timezone.now().replace(year=2023, month=3, day=15))
+        self.old_post.refresh_from_db()
+        reconcile_monthly_stats()
+
+    def test_global_and_author_feeds(self):
+        rss = self.client.get(reverse('feed_rss'))
+        self.assertContains(rss, 'Syndicated post')
+        self.assertEqual(rss['X-Blog-Cache'], 'miss')
+        atom = self.client.get(reverse('author_feed_atom', kwargs={'username': 'syndicated'}))
+        self.assertContains(atom, 'Posts by syndicated')
+        self.assertTrue(atom['Content-Type'].startswith('application/atom+xml'))
+        self.assertNotContains(self.client.get(reverse('author_feed_rss', kwargs={'username': 'quiet'})), '<item>')
+        self.assertEqual(self.client.get(reverse('author_feed_rss', kwargs={'username': 'nobody'})).status_code, 404)
+
+    def test_feed_cached_until_post_saved(self):
+        self.client.get(reverse('feed_atom'))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse('feed_atom'))['X-Blog-Cache'], 'hit')
+        Post.objects.create(title='Brand new entry', content='Fresh content body.', author=self.other)
+        self.assertContains(self.client.get(reverse('feed_atom')), 'Brand new entry')
+
+    def test_sitemap_index_lists_month_shards(self):
+        response = self.client.get(reverse('sitemap_index'))
+        section = reverse('sitemap_section', kwargs={'section': '2023-03'})
+        self.assertContains(response, f'http://testserver{section}')
+        current = reverse('sitemap_section', kwargs={'section': timezone.now().strftime('%Y-%m')})
+        self.assertContains(response, current)
+
+    def test_sitemap_index_reads_monthly_rollup(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('sitemap_index'))
+        self.assertFalse(any('"blog_post"' in query['sql'] for query in queries))
+        self.old_post.save()
+        archived = PostMonthlyStats.objects.for_author().get(month=self.old_post.created_at.date().replace(day=1))
+        self.assertEqual(archived.last_modified, self.old_post.updated_at)
+        self.assertContains(self.client.get(reverse('sitemap_index')), f'<lastmod>{self.old_post.updated_at:%Y-%m-%d}')
+
+    def test_migration_backfills_last_modified(self):
+        PostMonthlyStats.objects.update(last_modified=None)
+        backfill = import_module('blog.migrations.0017_postmonthlystats_last_modified').backfill_last_modified
+        backfill(django_apps, SimpleNamespace(connection=connection))
+        self.assertFalse(PostMonthlyStats.objects.filter(last_modified__isnull=True).exists())
+        self.assertEqual(reconcile_monthly_stats(dry_run=True), 0)
+
+    def test_closed_month_shard_not_regenerated_by_new_posts(self):
+        url = reverse('sitemap_section', kwargs={'section': '2023-03'})
+        response = self.client.get(url)
+        self.assertContains(response, self.old_post.get_absolute_url())
+        self.assertNotContains(response, self.post.get_absolute_url())
+        Post.objects.create(title='Current month post', content='Fresh content body.', author=self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url)['X-Blog-Cache'], 'hit')
+        self.old_post.save()
+        self.assertEqual(self.client.get(url)['X-Blog-Cache'], 'miss')
+
+    def test_invalid_section(self):
+        self.assertEqual(self.client.get(reverse('sitemap_section', kwargs={'section': '2023-13'})).status_code, 404)
+        self.assertEqual(self.client.get(reverse('sitemap_section', kwargs={'section': '2023-3'})).status_code, 404)
+
+
+@override_settings(BLOG_VIEW_COUNT_FLUSH_THRESHOLD=3, BLOG_VIEW_COUNT_FLUSH_INTERVAL=3600)
+class ViewCounterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        view_counter.drain()
+        self.user = User.objects.create_user(username='viewed', password='testpass123')
+        self.first = Post.objects.create(title='Popular post', content='Viewed content body.', author=self.user)
+        self.second = Post.objects.create(title='Quiet post', content='Viewed content body.', author=self.user)
+
+    def tearDown(self):
+        view_counter.drain()
+
+    def test_views_buffered_until_threshold(self):
+        url = reverse('post_detail', kwargs={'pk': self.first.pk})
+        self.client.get(url)
+        self.client.get(url)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.view_count, 0)
+        self.client.get(url)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.view_count, 3)
+        self.assertEqual(view_counter.pending_total, 0)
+
+    def test_flush_writes_batched_case_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            write_view_counts({self.first.pk: 5, self.second.pk: 2})
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "blog_post"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('CASE', updates[0])
+        write_view_counts({self.first.pk: 1})
+        self.assertEqual(
+            dict(Post.objects.values_list('title', 'view_count')),
+            {'Popular post': 6, 'Quiet post': 2},
+        )
+
+    def test_most_viewed_this_week_uses_rollup(self):
+        write_view_counts({self.first.pk: 5, self.second.pk: 2})
+        write_view_counts({self.second.pk: 9}, week=current_week() - timedelta(days=7))
+        self.assertEqual([entry.post_id for entry in most_viewed()], [self.first.pk, self.second.pk])
+        self.assertEqual(PostWeeklyViews.objects.get(post=self.first, week=current_week()).views, 5)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('popular_posts'))
+        self.assertContains(response, '5 views this week')
+
+    def test_deleted_posts_are_skipped(self):
+        pk = self.second.pk
+        self.second.delete()
+        write_view_counts({self.first.pk: 1, pk: 4})
+        self.assertEqual(PostWeeklyViews.objects.count(), 1)
+
+
+class MarkdownRenderingTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='markdown', password='testpass123')
+
+    def test_markdown_rendered_and_escaped_on_save(self):
+        post = Post.objects.create(
+            title='Formatted post',
+            content='## Setup\n\nUse **gunicorn** and `nginx`.\n\n<script>alert(1)</script> [bad](javascript:alert(1))',
+            author=self.user,
+        )
+        self.assertIn('<h2>Setup</h2>', post.content_html)
+        self.assertIn('<strong>gunicorn</strong>', post.content_html)
+        self.assertNotIn('<script>', post.content_html)
+        self.assertNotIn('href="javascript', post.content_html)
+        self.assertEqual(post.content_html_key, content_key(post.content))
+        response = self.client.get(reverse('post_detail', kwargs={'pk': post.pk}))
+        self.assertContains(response, '<code>nginx</code>', html=True)
+
+    def test_unchanged_content_is_not_rerendered(self):
+        post = Post.objects.create(title='Stable post', content='Plain *text* body.', author=self.user)
+        post.content_html = 'stored'
+        post.title = 'Renamed stable post'
+        post.save()
+        self.assertEqual(post.content_html, 'stored')
+        post.content = 'Changed *text* body.'
+        post.save(update_fields=['content'])
+        post.refresh_from_db()
+        self.assertIn('<em>text</em>', post.content_html)
+
+    def test_render_posts_command_refreshes_stale_html(self):
+        post = Post.objects.create(title='Stale post', content='Some **bold** body.', author=self.user)
+        Post.objects.filter(pk=post.pk).update(content_html='old', content_html_key='outdated')
+        self.assertIn('<strong>bold</strong>', Post.objects.get(pk=post.pk).body_html)
+        output = StringIO()
+        call_command('render_posts', workers=1, stdout=output)
+        self.assertIn('Rendered 1 posts', output.getvalue())
+        post.refresh_from_db()
+        self.assertIn('<strong>bold</strong>', post.content_html)
+        call_command('render_posts', workers=1, stdout=output)
+        self.assertIn('Rendered 0 posts', output.getvalue())
+        call_command('render_posts', workers=2, force=True, stdout=output)
+        self.assertIn('Rendered 1 posts', output.getvalue().splitlines()[-1])
+
+    def test_etag_changes_when_html_is_rerendered(self):
+        post = Post.objects.create(title='Stale post', content='Some **bold** body.', author=self.user)
+        Post.objects.filter(pk=post.pk).update(content_html='old', content_html_key='outdated')
+        url = reverse('post_detail', kwargs={'pk': post.pk})
+        headers = {'HTTP_IF_NONE_MATCH': self.client.get(url)['ETag']}
+        call_command('render_posts', workers=1, stdout=StringIO())
+        self.assertEqual(self.client.get(url, **headers).status_code, 200)
+
+    def test_migration_backfills_existing_posts(self):
+        post = Post.objects.create(title='Legacy post', content='Some **bold** body.', author=self.user)
+        Post.objects.filter(pk=post.pk).update(content_html='', content_html_key='')
+        backfill = import_module('blog.migrations.0016_backfill_post_content_html').backfill_content_html
+        backfill(django_apps, SimpleNamespace(connection=connection))
+        post.refresh_from_db()
+        self.assertEqual(post.content_html_key, content_key(post.content))
+        self.assertIn('<strong>bold</strong>', post.content_html)
+
+
+class RelatedPostsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='related', password='testpass123')
+        self.docker = Post.objects.create(
+            title='Docker containers for django',
+            content='Building docker images and containers for django deployments with compose.',
+            author=self.user,
+        )
+        self.compose = Post.objects.create(
+            title='Docker compose tips',
+            content='Compose files describe docker containers, volumes and networks.',
+            author=self.user,
+        )
+        self.baking = Post.objects.create(
+            title='Sourdough baking',
+            content='Flour, water and salt make a sourdough loaf after a long proof.',
+            author=self.user,
+        )
+
+    def test_rebuild_stores_top_neighbors(self):
+        self.assertEqual(rebuild_related_posts(k=1), 3)
+        self.assertEqual(related_posts(self.docker), [self.compose])
+        self.assertEqual(related_posts(self.compose), [self.docker])
+        self.assertEqual(RelatedPost.objects.filter(post=self.baking).count(), 0)
+
+    def test_new_post_updates_neighbors_incrementally(self):
+        rebuild_related_posts()
+        bread = Post.objects.create(
+            title='Sourdough starter', content='Feed the sourdough starter flour and water daily.', author=self.user,
+        )
+        self.assertEqual(related_posts(bread), [])
+        self.assertEqual(refresh_stale_related_posts(), 1)
+        self.assertEqual(related_posts(bread), [self.baking])
+        self.assertIn(bread, related_posts(self.baking))
+        bread.content = 'Docker containers and compose volumes.'
+        bread.title = 'Docker volumes'
+        bread.save()
+        self.assertEqual(refresh_stale_related_posts(), 1)
+        self.assertNotIn(bread, related_posts(self.baking))
+        self.assertEqual(set(related_posts(bread)), {self.docker, self.compose})
+        self.assertEqual(refresh_stale_related_posts(), 0)
+
+    def test_saving_post_does_not_score_it_inline(self):
+        rebuild_related_posts()
+        with CaptureQueriesContext(connection) as queries:
+            post = Post.objects.create(title='Docker swarm', content='Docker containers at scale.', author=self.user)
+        self.assertFalse(any('blog_postterm' in query['sql'] for query in queries))
+        self.assertTrue(Post.objects.get(pk=post.pk).related_stale)
+        Post.objects.filter(pk=post.pk).update(related_stale=False)
+        post.view_count = 5
+        post.save(update_fields=['view_count'])
+        self.assertFalse(Post.objects.get(pk=post.pk).related_stale)
+
+    def test_neighbor_etag_changes_when_related_list_changes(self):
+        rebuild_related_posts()
+        url = reverse('post_detail', kwargs={'pk': self.baking.pk})
+        headers = {'HTTP_IF_NONE_MATCH': self.client.get(url)['ETag']}
+        Post.objects.create(title='Sourdough starter', content='Feed the sourdough starter flour.', author=self.user)
+        self.assertEqual(self.client.get(url, **headers).status_code, 304)
+        refresh_stale_related_posts()
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Sourdough starter')
+
+    def test_detail_page_shows_related_posts_with_one_lookup(self):
+        rebuild_related_posts()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('post_detail', kwargs={'pk': self.docker.pk}))
+        self.assertContains(response, 'Docker compose tips')
+        lookups = [
+            query for query in queries if 'blog_relatedpost' in query['sql'] and 'related_count' not in query['sql']
+        ]
+        self.assertEqual(len(lookups), 1)
+
+
+class TagTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='tagger', password='testpass123')
+        self.client.login(username='tagger', password='testpass123')
+
+    def counts(self):
+        return dict(Tag.objects.values_list('slug', 'post_count'))
+
+    def create_post(self, title, tags):
+        self.client.post(reverse('post_create'), {
+            'title': title, 'content': 'Tagged content for the tag tests.', 'tags': tags,
+        })
+        return Post.objects.get(title=title)
+
+    def test_counters_follow_create_edit_and_delete(self):
+        first = self.create_post('First tagged post', 'Django, python, django')
+        self.create_post('Second tagged post', 'django')
+        self.assertEqual(self.counts(), {'django': 2, 'python': 1})
+        self.client.post(reverse('post_edit', kwargs={'pk': first.pk}), {
+            'title': first.title, 'content': first.content, 'tags': 'python, sqlite',
+        })
+        self.assertEqual(self.counts(), {'django': 1, 'python': 1, 'sqlite': 1})
+        self.client.post(reverse('post_delete', kwargs={'pk': first.pk}))
+        self.assertEqual(self.counts(), {'django': 1, 'python': 0, 'sqlite': 0})
+
+    def test_too_many_tags_is_rejected(self):
+        response = self.client.post(reverse('post_create'), {
+            'title': 'Over tagged post', 'content': 'Tagged content.', 'tags': ', '.join(f't{i}' for i in range(11)),
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Post.objects.filter(title='Over tagged post').exists())
+
+    def test_reconcile_repairs_drift(self):
+        self.create_post('Reconciled post', 'django')
+        Tag.objects.update(post_count=7)
+        self.assertEqual(reconcile_tag_counters(dry_run=True), 1)
+        self.assertEqual(reconcile_tag_counters(), 1)
+        self.assertEqual(self.counts(), {'django': 1})
+
+    def test_tag_page_paginates_with_cursor(self):
+        for i in range(8):
+            self.create_post(f'Tagged post {i}', 'django')
+        self.create_post('Untagged post', '')
+        response = self.client.get(reverse('tag_posts', kwargs={'slug': 'django'}))
+        page_obj = response.context['page_obj']
+        self.assertEqual([post.title for post in page_obj], [f'Tagged post {i}' for i in range(7, 1, -1)])
+        response = self.client.get(reverse('tag_posts', kwargs={'slug': 'django'}), {'page': page_obj.next_cursor})
+        self.assertEqual([post.title for post in response.context['page_obj']], ['Tagged post 1', 'Tagged post 0'])
+        self.assertEqual(self.client.get(reverse('tag_posts', kwargs={'slug': 'missing'})).status_code, 404)
+
+    def test_home_cloud_and_facets_read_counters(self):
+        self.create_post('Django search post', 'django, python')
+        self.create_post('Another django post', 'django')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('home'))
+        self.assertEqual([tag.slug for tag in response.context['tag_cloud']], ['django', 'python'])
+        self.assertFalse(any('GROUP BY' in query['sql'] for query in queries))
+        response = self.client.get(reverse('home'), {'search': 'pyth'})
+        self.assertEqual([tag.slug for tag in response.context['tag_facets']], ['python'])
+        self.assertContains(self.client.get(reverse('post_detail', kwargs={'pk': Post.objects.first().pk})), '#django')
+
+
+class MonthlyArchiveTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='archivist', password='testpass123')
+        self.other = User.objects.create_user(username='other_archivist')
+
+    def create_post(self, title, author, year, month):
+        created_at = timezone.make_aware(timezone.datetime(year, month, 15, 12))
+        with explicit_timestamps():
+            return Post.objects.create(
+                title=title, content='Archived content body.', author=author, created_at=created_at, updated_at=created_at,
+            )
+
+    def stats(self):
+        return {
+            (author_id, f'{month:%Y-%m}'): post_count
+            for author_id, month, post_count in PostMonthlyStats.objects.values_list('author', 'month', 'post_count')
+        }
+
+    def test_rollup_follows_create_and_delete(self):
+        first = self.create_post('March post one', self.user, 2023, 3)
+        self.create_post('March post two', self.other, 2023, 3)
+        self.create_post('April post', self.user, 2023, 4)
+        self.assertEqual(self.stats(), {
+            (None, '2023-03'): 2, (None, '2023-04'): 1,
+            (self.user.pk, '2023-03'): 1, (self.user.pk, '2023-04'): 1, (self.other.pk, '2023-03'): 1,
+        })
+        first.delete()
+        self.assertEqual(self.stats()[None, '2023-03'], 1)
+        self.assertEqual(self.stats()[self.user.pk, '2023-03'], 0)
+        self.assertEqual(reconcile_monthly_stats(), 0)
+
+    def test_reconcile_repairs_drift(self):
+        self.create_post('March post', self.user, 2023, 3)
+        PostMonthlyStats.objects.filter(author__isnull=True).update(post_count=5)
+        PostMonthlyStats.objects.filter(author=self.user).delete()
+        self.assertEqual(reconcile_monthly_stats(dry_run=True), 2)
+        self.assertEqual(reconcile_monthly_stats(), 2)
+        self.assertEqual(self.stats(), {(None, '2023-03'): 1, (self.user.pk, '2023-03'): 1})
+
+    def test_archive_month_lists_posts_and_months(self):
+        self.create_post('March post', self.user, 2023, 3)
+        self.create_post('April post', self.user, 2023, 4)
+        response = self.client.get(reverse('archive_month', kwargs={'year': 2023, 'month': 3}))
+        self.assertEqual([post.title for post in response.context['page_obj']], ['March post'])
+        self.assertContains(response, reverse('archive_month', kwargs={'year': 2023, 'month': 4}))
+        self.assertEqual(self.client.get(reverse('archive_month', kwargs={'year': 2023, 'month': 5})).status_code, 404)
+        self.assertEqual(self.client.get(reverse('archive_month', kwargs={'year': 2023, 'month': 13})).status_code, 404)
+        self.assertRedirects(
+            self.client.get(reverse('archive_index')), reverse('archive_month', kwargs={'year': 2023, 'month': 4})
+        )
+
+    def test_admin_drill_down_reads_rollup(self):
+        self.create_post('March post', self.user, 2023, 3)
+        self.create_post('Old post', self.user, 2022, 7)
+        admin_user = User.objects.create_superuser(username='admin', password='testpass123')
+        self.client.force_login(admin_user)
+        url = reverse('admin:blog_post_changelist')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'month': '2023'})
+        self.assertContains(response, 'March 2023 (1)')
+        self.assertNotContains(response, 'July 2022')
+        self.assertFalse(any('DISTINCT' in query['sql'] or 'django_date' in query['sql'] for query in queries))
+        response = self.client.get(url, {'month': '2023-03'})
+        self.assertEqual([post.title for post in response.context['cl'].result_list], ['March post'])
+
+
+class ReplicaMigrationTest(TestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='migrated', password='testpass123')
+        Post.objects.create(title='Migrated post', content='Migrated content body.', author=self.user)
+
+    def backfill(self, migration, function, alias):
+        backfill = getattr(import_module(f'blog.migrations.{migration}'), function)
+        backfill(django_apps, SimpleNamespace(connection=connections[alias]))
+
+    def test_monthly_stats_backfill_uses_migrated_database(self):
+        self.backfill('0013_post_monthly_stats', 'backfill_monthly_stats', 'replica')
+        self.assertEqual(PostMonthlyStats.objects.using('default').count(), 2)
+        self.assertFalse(PostMonthlyStats.objects.using('replica').exists())
+        PostMonthlyStats.objects.all().delete()
+        self.backfill('0013_post_monthly_stats', 'backfill_monthly_stats', 'default')
+        self.assertEqual(sum(PostMonthlyStats.objects.for_author().values_list('post_count', flat=True)), 1)
+
+    def test_excerpt_backfill_uses_migrated_database(self):
+        Post.objects.update(excerpt='', word_count=0)
+        self.backfill('0008_backfill_post_excerpts', 'backfill_excerpts', 'replica')
+        self.assertEqual(Post.objects.get().excerpt, '')
+        self.backfill('0008_backfill_post_excerpts', 'backfill_excerpts', 'default')
+        post = Post.objects.get()
+        self.assertEqual((post.excerpt, post.word_count), ('Migrated content body.', 3))
+
+
+@override_settings(BLOG_REPLICA_DATABASES=['replica'], BLOG_REPLICA_STICKY_SECONDS=15)
+class ReplicaRoutingTest(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='primary', password='testpass123')
+        self.post = Post.objects.create(title='Replicated post', content='Replicated content body.', author=self.user)
+        sync_sqlite_replica('replica')
+
+    def test_router_sends_writes_to_primary(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_write(Post), 'default')
+        self.assertEqual(router.db_for_read(Post), 'default')
+        self.assertFalse(router.allow_migrate('replica', 'blog'))
+
+    def test_read_views_serve_lagging_replica(self):
+        Post.objects.create(title='Not yet replicated', content='Lagging content body.', author=self.user)
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Replicated post')
+        self.assertNotContains(response, 'Not yet replicated')
+        call_command('sync_replica', stdout=StringIO())
+        self.assertContains(self.client.get(reverse('home')), 'Not yet replicated')
+
+    def test_cache_misses_fill_from_primary(self):
+        Post.objects.create(title='Not yet replicated', content='Lagging content body.', author=self.user)
+        self.assertContains(self.client.get(reverse('feed_rss')), 'Not yet replicated')
+        with override_settings(BLOG_PAGE_CACHE_ENABLED=True):
+            response = self.client.get(reverse('home'))
+            self.assertEqual(response['X-Blog-Cache'], 'miss')
+            self.assertContains(response, 'Not yet replicated')
+            self.assertEqual(self.client.get(reverse('home'))['X-Blog-Cache'], 'hit')
+
+    @override_settings(ROOT_URLCONF='blog.async_urls')
+    def test_async_views_read_from_replica(self):
+        Post.objects.create(title='Not yet replicated', content='Lagging content body.', author=self.user)
+        response = async_to_sync(self.async_client.get)(reverse('home'))
+        self.assertContains(response, 'Replicated post')
+        self.assertNotContains(response, 'Not yet replicated')
+
+    def test_reads_stick_to_primary_after_post(self):
+        self.client.login(username='primary', password='testpass123')
+        response = self.client.post(
+            reverse('post_create'), {'title': 'Fresh write', 'content': 'Read your own writes.'}, follow=True,
+        )
+        self.assertContains(response, 'Read your own writes.')
+        self.assertContains(self.client.get(reverse('home')), 'Fresh write')
+        with override_settings(BLOG_REPLICA_STICKY_SECONDS=-1):
+            self.client.post(reverse('post_create'), {'title': 'Expired pin', 'content': 'Lagging content.'})
+        self.assertNotContains(self.client.get(reverse('home')), 'Fresh write')
+
+    def test_reads_use_primary_when_no_replicas_configured(self):
+        Post.objects.create(title='Primary only post', content='Primary content body.', author=self.user)
+        with override_settings(BLOG_REPLICA_DATABASES=[]):
+            self.assertContains(self.client.get(reverse('home')), 'Primary only post')
+
+
+class SQLiteProfileTest(TransactionTestCase):
+    def test_pragmas_applied_on_connect(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA temp_store')
+            self.assertEqual(cursor.fetchone()[0], 2)
+
+    def test_write_transactions_begin_immediate(self):
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                Post.objects.count()
+        self.assertEqual(queries[0]['sql'], 'BEGIN IMMEDIATE')
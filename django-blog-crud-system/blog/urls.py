@@ -1,15 +1,30 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import views, async_views
 
-urlpatterns = [
-    path('', views.home, name='home'),
-    path('register/', views.register, name='register'),
-    path('login/', views.user_login, name='login'),
-    path('logout/', views.user_logout, name='logout'),
-    path('dashboard/', views.dashboard, name='dashboard'),
-    path('post/<int:pk>/', views.post_detail, name='post_detail'),
-    path('post/new/', views.post_create, name='post_create'),
-    path('post/<int:pk>/edit/', views.post_edit, name='post_edit'),
-    path('post/<int:pk>/delete/', views.post_delete, name='post_delete'),
-    path('author/<str:username>/', views.author_posts, name='author_posts'),
-]
+def build_urlpatterns(read_views):
+    return [
+        path('', read_views.home, name='home'),
+        path('register/', views.register, name='register'),
+        path('login/', views.user_login, name='login'),
+        path('logout/', views.user_logout, name='logout'),
+        path('dashboard/', views.dashboard, name='dashboard'),
+        path('post/<int:pk>/', read_views.post_detail, name='post_detail'),
+        path('popular/', views.popular_posts, name='popular_posts'),
+        path('tag/<slug:slug>/', views.tag_posts, name='tag_posts'),
+        path('archive/', views.archive_index, name='archive_index'),
+        path('archive/<int:year>/<int:month>/', views.archive_month, name='archive_month'),
+        path('post/new/', views.post_create, name='post_create'),
+        path('post/<int:pk>/edit/', views.post_edit, name='post_edit'),
+        path('post/<int:pk>/delete/', views.post_delete, name='post_delete'),
+        path('author/<str:username>/', read_views.author_posts, name='author_posts'),
+        path('export/posts/', views.export_posts, name='export_posts'),
+        path('feed/rss/', views.feed_rss, name='feed_rss'),
+        path('feed/atom/', views.feed_atom, name='feed_atom'),
+        path('author/<str:username>/feed/rss/', views.author_feed_rss, name='author_feed_rss'),
+        path('author/<str:username>/feed/atom/', views.author_feed_atom, name='author_feed_atom'),
+        path('sitemap.xml', views.sitemap_index, name='sitemap_index'),
+        path('sitemap-<str:section>.xml', views.sitemap_section, name='sitemap_section'),
+    ]
+
+urlpatterns = build_urlpatterns(async_views if getattr(settings, 'BLOG_ASYNC_VIEWS', False) else views)
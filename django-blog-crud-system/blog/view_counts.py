@@ -0,0 +1,129 @@
+import atexit
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+from .models import POST_CARD_FIELDS, Post, PostWeeklyViews
+
+FLUSH_BATCH_SIZE = 400
+
+
+def current_week(today=None):
+    today = today or timezone.localdate()
+    return today - timedelta(days=today.weekday())
+
+
+def increment_case(counts, field='pk'):
+    return Case(
+        *[When(**{field: pk}, then=Value(count)) for pk, count in counts.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def write_view_counts(counts, week=None):
+    week = week or current_week()
+    pending = sorted(counts.items())
+    for start in range(0, len(pending), FLUSH_BATCH_SIZE):
+        batch = dict(pending[start:start + FLUSH_BATCH_SIZE])
+        with transaction.atomic():
+            Post.objects.filter(pk__in=batch).update(view_count=F('view_count') + increment_case(batch))
+            existing = set(Post.objects.filter(pk__in=batch).values_list('pk', flat=True))
+            PostWeeklyViews.objects.bulk_create(
+                [PostWeeklyViews(post_id=pk, week=week) for pk in batch if pk in existing],
+                ignore_conflicts=True,
+            )
+            PostWeeklyViews.objects.filter(week=week, post_id__in=batch).update(
+                views=F('views') + increment_case(batch, 'post_id')
+            )
+
+
+class ViewCounter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = Counter()
+        self.last_flush = time.monotonic()
+
+    @property
+    def pending_total(self):
+        return sum(self.pending.values())
+
+    def flush_due(self):
+        interval = getattr(settings, 'BLOG_VIEW_COUNT_FLUSH_INTERVAL', 30)
+        threshold = getattr(settings, 'BLOG_VIEW_COUNT_FLUSH_THRESHOLD', 200)
+        return self.pending_total >= threshold or time.monotonic() - self.last_flush >= interval
+
+    def record(self, pk):
+        with self.lock:
+            self.pending[pk] += 1
+            return self.flush_due()
+
+    def drain(self):
+        with self.lock:
+            counts, self.pending = self.pending, Counter()
+            self.last_flush = time.monotonic()
+            return counts
+
+    def flush(self):
+        counts = self.drain()
+        if not counts:
+            return 0
+        try:
+            write_view_counts(counts)
+        except DatabaseError:
+            with self.lock:
+                self.pending.update(counts)
+            raise
+        return sum(counts.values())
+
+
+view_counter = ViewCounter()
+
+
+def flush_at_exit():
+    try:
+        view_counter.flush()
+    except DatabaseError:
+        pass
+
+
+atexit.register(flush_at_exit)
+
+
+def is_counted_view(request, response, pk):
+    return request.method == 'GET' and response.status_code in (200, 304) and view_counter.record(pk)
+
+
+def count_post_view(view_func):
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            response = await view_func(request, *args, **kwargs)
+            if is_counted_view(request, response, kwargs['pk']):
+                await sync_to_async(view_counter.flush)()
+            return response
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        response = view_func(request, *args, **kwargs)
+        if is_counted_view(request, response, kwargs['pk']):
+            view_counter.flush()
+        return response
+    return wrapper
+
+
+def most_viewed(limit=10, week=None):
+    return (
+        PostWeeklyViews.objects.filter(week=week or current_week())
+        .select_related('post__author')
+        .only('views', 'week', 'post_id', *[f'post__{field}' for field in POST_CARD_FIELDS])
+        .order_by('-views', 'post_id')[:limit]
+    )
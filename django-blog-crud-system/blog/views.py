@@ -1,40 +1,78 @@
+from datetime import date
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.paginator import Paginator
+from django.http import Http404, HttpResponseBadRequest, StreamingHttpResponse
+from django.template.response import TemplateResponse
+from django.contrib.sitemaps import views as sitemap_views
+from django.contrib.sitemaps.views import SitemapIndexItem
+from django.urls import reverse
+from django.views.decorators.http import require_GET
+from django.conf import settings
 from django.db.models import Count, Q
-from datetime import datetime, timedelta
-from .models import Post
+from django.utils import timezone
+from .models import Post, PostMonthlyStats, PostTag, Tag, POST_CARD_FIELDS, RECENT_POSTS_WINDOW
 from .forms import UserRegisterForm, PostForm
+from .search import get_search_backend
+from .pagination import CursorPaginator
+from .cache import (
+    cache_feed, cache_public_page, GLOBAL_GENERATION, RELATED_GENERATION, author_generation, month_generation,
+    post_generation,
+)
+from .conditional import condition, listing_etag, listing_last_modified, post_etag, post_last_modified
+from .export import CONTENT_TYPES, ExportError, export_queryset, iter_export
+from .feeds import AtomAuthorPostsFeed, AtomLatestPostsFeed, AuthorPostsFeed, LatestPostsFeed
+from .sitemaps import MonthlyPostSitemap, month_bounds, parse_section, post_month_sections
+from .view_counts import count_post_view, most_viewed
+from .related import related_posts
+from .replicas import replica_reads
 
-def home(request):
-    posts = Post.objects.all()
+POSTS_PER_PAGE = 6
+
+SORT_ORDERINGS = {
+    'newest': ('-created_at', '-id'),
+    'oldest': ('created_at', 'id'),
+    'title': ('title', 'id'),
+    'relevance': ('search_rank', '-id'),
+}
+
+TAG_ORDERING = ('-created_at', '-post_id')
+
+def post_paginator(posts, ordering=SORT_ORDERINGS['newest']):
+    count_limit = getattr(settings, 'BLOG_APPROXIMATE_COUNT_LIMIT', None)
+    return CursorPaginator(posts, POSTS_PER_PAGE, ordering=ordering, count_limit=count_limit)
+
+def paginate_posts(request, posts, ordering=SORT_ORDERINGS['newest']):
+    return post_paginator(posts, ordering).get_page(request.GET.get('page'))
+
+def home_listing(request):
+    posts = Post.objects.cards()
     
     search_query = request.GET.get('search', '')
     if search_query:
-        posts = posts.filter(
-            Q(title__icontains=search_query) | 
-            Q(content__icontains=search_query) |
-            Q(author__username__icontains=search_query)
-        )
+        posts = get_search_backend().search(posts, search_query)
     
-    sort_by = request.GET.get('sort', 'newest')
-    if sort_by == 'oldest':
-        posts = posts.order_by('created_at')
-    elif sort_by == 'title':
-        posts = posts.order_by('title')
-    else:
-        posts = posts.order_by('-created_at')
+    sort_by = request.GET.get('sort', 'relevance' if search_query else 'newest')
+    if sort_by not in SORT_ORDERINGS or (sort_by == 'relevance' and not search_query):
+        sort_by = 'newest'
     
-    paginator = Paginator(posts, 6)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    return posts, search_query, sort_by
+
+@replica_reads
+@condition(etag_func=listing_etag, last_modified_func=listing_last_modified)
+@cache_public_page('home', lambda: [GLOBAL_GENERATION])
+def home(request):
+    posts, search_query, sort_by = home_listing(request)
+    page_obj = paginate_posts(request, posts, SORT_ORDERINGS[sort_by])
     
     context = {
         'page_obj': page_obj,
         'search_query': search_query,
         'sort_by': sort_by,
+        'tag_cloud': Tag.objects.popular(),
+        'tag_facets': Tag.objects.matching(search_query) if search_query else [],
     }
     
     return render(request, 'blog/home.html', context)
@@ -83,26 +121,31 @@ def user_logout(request):
 @login_required
 def dashboard(request):
     user_posts = Post.objects.filter(author=request.user)
-    total_posts = user_posts.count()
-    
-    today = datetime.now().date()
-    week_ago = today - timedelta(days=7)
-    posts_this_week = user_posts.filter(created_at__date__gte=week_ago).count()
-    
-    recent_posts = user_posts[:5]
+    stats = user_posts.aggregate(
+        total_posts=Count('id'),
+        posts_this_week=Count('id', filter=Q(created_at__gte=timezone.now() - RECENT_POSTS_WINDOW)),
+    )
     
     context = {
-        'posts': user_posts,
-        'total_posts': total_posts,
-        'posts_this_week': posts_this_week,
-        'recent_posts': recent_posts,
+        'page_obj': paginate_posts(request, user_posts.cards()),
+        'total_posts': stats['total_posts'],
+        'posts_this_week': stats['posts_this_week'],
+        'recent_activity': min(stats['total_posts'], 5),
     }
     
     return render(request, 'blog/dashboard.html', context)
 
+@replica_reads
+@count_post_view
+@condition(etag_func=post_etag, last_modified_func=post_last_modified)
+@cache_public_page('post_detail', lambda pk: [RELATED_GENERATION, post_generation(pk)])
 def post_detail(request, pk):
-    post = get_object_or_404(Post, pk=pk)
-    return render(request, 'blog/post_detail.html', {'post': post})
+    post = get_object_or_404(Post.objects.select_related('author').prefetch_related('tags'), pk=pk)
+    return render(request, 'blog/post_detail.html', {'post': post, 'related_posts': related_posts(post)})
+
+@replica_reads
+def popular_posts(request):
+    return render(request, 'blog/popular_posts.html', {'ranking': most_viewed()})
 
 @login_required
 def post_create(request):
@@ -112,6 +155,7 @@ def post_create(request):
             post = form.save(commit=False)
             post.author = request.user
             post.save()
+            form.save_m2m()
             messages.success(request, 'Post created successfully!')
             return redirect('post_detail', pk=post.pk)
     else:
@@ -153,19 +197,121 @@ def post_delete(request, pk):
     
     return render(request, 'blog/post_confirm_delete.html', {'post': post})
 
+@replica_reads
+@condition(etag_func=listing_etag, last_modified_func=listing_last_modified)
+@cache_public_page('author_posts', lambda username: [author_generation(username)])
 def author_posts(request, username):
     from django.contrib.auth.models import User
-    author = get_object_or_404(User, username=username)
-    posts = Post.objects.filter(author=author)
+    author = get_object_or_404(User.objects.select_related('profile'), username=username)
+    posts = Post.objects.filter(author=author).cards()
     
-    paginator = Paginator(posts, 6)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    page_obj = paginate_posts(request, posts)
     
     context = {
         'author': author,
         'page_obj': page_obj,
-        'total_posts': posts.count(),
+        'total_posts': author.profile.total_posts,
     }
     
     return render(request, 'blog/author_posts.html', context)
+
+@replica_reads
+@cache_public_page('tag_posts', lambda slug: [GLOBAL_GENERATION])
+def tag_posts(request, slug):
+    tag = get_object_or_404(Tag, slug=slug)
+    post_tags = PostTag.objects.filter(tag=tag).select_related('post__author').only(
+        'created_at', 'post_id', *(f'post__{field}' for field in POST_CARD_FIELDS)
+    )
+    
+    page_obj = post_paginator(post_tags, TAG_ORDERING).get_page(request.GET.get('page'))
+    page_obj.object_list = [post_tag.post for post_tag in page_obj.object_list]
+    
+    context = {
+        'tag': tag,
+        'page_obj': page_obj,
+    }
+    
+    return render(request, 'blog/tag_posts.html', context)
+
+@replica_reads
+def archive_index(request):
+    latest = PostMonthlyStats.objects.months().first()
+    if latest is None:
+        return redirect('home')
+    return redirect('archive_month', year=latest.month.year, month=latest.month.month)
+
+@replica_reads
+@cache_public_page('archive_month', lambda year, month: [GLOBAL_GENERATION])
+def archive_month(request, year, month):
+    if not 1 <= year < 9999 or not 1 <= month <= 12:
+        raise Http404('Unknown archive month')
+    months = list(PostMonthlyStats.objects.months())
+    stats = next((row for row in months if row.month == date(year, month, 1)), None)
+    if stats is None:
+        raise Http404('No posts in this month')
+    
+    start, end = month_bounds(year, month)
+    posts = Post.objects.filter(created_at__gte=start, created_at__lt=end).cards()
+    page_obj = paginate_posts(request, posts)
+    
+    context = {
+        'stats': stats,
+        'months': months,
+        'page_obj': page_obj,
+    }
+    
+    return render(request, 'blog/archive_month.html', context)
+
+@require_GET
+def export_posts(request):
+    export_format = request.GET.get('format', 'ndjson')
+    if export_format not in CONTENT_TYPES:
+        return HttpResponseBadRequest(f'Unsupported format: {export_format}')
+    
+    try:
+        queryset, paginator = export_queryset(
+            author=request.GET.get('author'),
+            start=request.GET.get('start'),
+            end=request.GET.get('end'),
+            since=request.GET.get('since'),
+        )
+    except ExportError as error:
+        return HttpResponseBadRequest(str(error))
+    
+    return StreamingHttpResponse(
+        iter_export(export_format, queryset, paginator),
+        content_type=CONTENT_TYPES[export_format],
+    )
+
+feed_rss = replica_reads(cache_feed('feed_rss', lambda: [GLOBAL_GENERATION])(LatestPostsFeed()))
+feed_atom = replica_reads(cache_feed('feed_atom', lambda: [GLOBAL_GENERATION])(AtomLatestPostsFeed()))
+author_feed_rss = replica_reads(
+    cache_feed('author_feed_rss', lambda username: [author_generation(username)])(AuthorPostsFeed())
+)
+author_feed_atom = replica_reads(
+    cache_feed('author_feed_atom', lambda username: [author_generation(username)])(AtomAuthorPostsFeed())
+)
+
+@require_GET
+@replica_reads
+@cache_feed('sitemap_index', lambda: [GLOBAL_GENERATION])
+def sitemap_index(request):
+    sitemaps = []
+    for section, total, lastmod in post_month_sections():
+        location = request.build_absolute_uri(reverse('sitemap_section', kwargs={'section': section}))
+        sitemaps.append(SitemapIndexItem(location, lastmod))
+        pages = -(-total // MonthlyPostSitemap.limit)
+        for page in range(2, pages + 1):
+            sitemaps.append(SitemapIndexItem(f'{location}?p={page}', lastmod))
+    
+    return TemplateResponse(request, 'sitemap_index.xml', {'sitemaps': sitemaps}, content_type='application/xml')
+
+@require_GET
+@replica_reads
+@cache_feed('sitemap_section', lambda section: [month_generation(section)])
+def sitemap_section(request, section):
+    month = parse_section(section)
+    if month is None:
+        raise Http404('Unknown sitemap section')
+    
+    return sitemap_views.sitemap(request, {section: MonthlyPostSitemap(*month)}, section=section)
@@ -15,15 +15,18 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
     'blog',
 ]
 
 MIDDLEWARE = [
+    'blog.middleware.RequestInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blog.replicas.PrimaryStickinessMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -48,13 +51,37 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'blog_system.wsgi.application'
 
+SQLITE_OPTIONS = {
+    'transaction_mode': 'IMMEDIATE',
+    'pragmas': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -20000,
+        'mmap_size': 134217728,
+        'temp_store': 'MEMORY',
+    },
+}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'blog_system.sqlite_backend',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'OPTIONS': SQLITE_OPTIONS,
+    },
+    'replica': {
+        'ENGINE': 'blog_system.sqlite_backend',
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'OPTIONS': SQLITE_OPTIONS,
+    },
 }
 
+DATABASE_ROUTERS = ['blog.replicas.ReplicaRouter']
+
+BLOG_REPLICA_DATABASES = []
+
+BLOG_REPLICA_STICKY_SECONDS = 15
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -85,3 +112,24 @@ LOGIN_REDIRECT_URL = 'dashboard'
 LOGOUT_REDIRECT_URL = 'home'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+INSTRUMENTATION_SERVER_TIMING = True
+INSTRUMENTATION_LOG_JSON = False
+INSTRUMENTATION_N_PLUS_ONE_THRESHOLD = 5
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'blog.instrumentation': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
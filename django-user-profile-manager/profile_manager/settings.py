@@ -54,6 +54,17 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': (
+                'PRAGMA journal_mode = WAL;'
+                'PRAGMA synchronous = NORMAL;'
+                'PRAGMA busy_timeout = 5000;'
+                'PRAGMA cache_size = -20000;'
+                'PRAGMA mmap_size = 134217728;'
+                'PRAGMA temp_store = MEMORY;'
+            ),
+        },
     }
 }
 
@@ -79,6 +90,9 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+THUMBNAIL_WORKERS = 2
+THUMBNAIL_QUEUE_SIZE = 32
+
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880
 
 LOGIN_URL = 'login'
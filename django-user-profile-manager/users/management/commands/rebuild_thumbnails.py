@@ -0,0 +1,54 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from users.models import UserProfile
+from users.thumbnails import generate_thumbnails, mark_thumbnails_ready
+
+class Command(BaseCommand):
+    help = 'Generate responsive thumbnails for existing profile pictures'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--force', action='store_true')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        self.built = self.failed = 0
+        pictures = self.iter_pictures(options['force'])
+
+        if options['workers'] <= 1:
+            for pk, name in pictures:
+                self.store(pk, name, lambda: generate_thumbnails(name))
+        else:
+            with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+                pending = deque()
+                for pk, name in pictures:
+                    pending.append((pk, name, executor.submit(generate_thumbnails, name)))
+                    if len(pending) >= options['workers'] * 2:
+                        pk, name, future = pending.popleft()
+                        self.store(pk, name, future.result)
+                while pending:
+                    pk, name, future = pending.popleft()
+                    self.store(pk, name, future.result)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Built thumbnails for {self.built} profiles ({self.failed} failed) in {time.perf_counter() - started:.1f}s'
+        ))
+
+    def iter_pictures(self, force):
+        profiles = UserProfile.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True)
+        rows = profiles.order_by('pk').values_list('pk', 'profile_picture', 'thumbnail_source', 'thumbnail_widths')
+        return [(pk, name) for pk, name, source, widths in rows if force or name != source or not widths]
+
+    def store(self, pk, name, result):
+        try:
+            widths = result()
+        except Exception as error:
+            self.failed += 1
+            self.stderr.write(f'Skipped {name}: {error}')
+            return
+        mark_thumbnails_ready(pk, name, widths)
+        self.built += 1
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_userprofile_thumbnail_source'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='thumbnail_widths',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
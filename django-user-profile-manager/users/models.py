@@ -1,10 +1,45 @@
-from django.db import models
+from functools import partial
+from django.db import models, transaction
+from django.db.models import DEFERRED
 from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from .validators import validate_image_size, validate_image_extension
 
-class UserProfile(models.Model):
+class DirtyFieldsMixin:
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if value is not DEFERRED
+        }
+        return instance
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_values = {field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields}
+    
+    def get_dirty_fields(self):
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return None
+        return [
+            field.name for field in self._meta.concrete_fields
+            if field.attname in loaded and getattr(self, field.attname) != loaded[field.attname]
+        ]
+    
+    def save_dirty_fields(self):
+        dirty = self.get_dirty_fields()
+        if dirty is None:
+            self.save()
+            return True
+        if not dirty:
+            return False
+        auto_now = [field.name for field in self._meta.concrete_fields if getattr(field, 'auto_now', False)]
+        self.save(update_fields=set(dirty + auto_now))
+        return True
+
+class UserProfile(DirtyFieldsMixin, models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     profile_picture = models.ImageField(
         upload_to='profile_pics/', 
@@ -12,6 +47,8 @@ class UserProfile(models.Model):
         null=True,
         validators=[validate_image_size, validate_image_extension]
     )
+    thumbnail_source = models.CharField(max_length=100, blank=True, editable=False)
+    thumbnail_widths = models.JSONField(default=dict, blank=True, editable=False)
     full_name = models.CharField(max_length=200, blank=True)
     father_name = models.CharField(max_length=200, blank=True)
     date_of_birth = models.DateField(null=True, blank=True)
@@ -145,4 +182,16 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
-    instance.profile.save()
+    profile = User.profile.related.get_cached_value(instance, None)
+    if profile is not None:
+        profile.save_dirty_fields()
+
+@receiver(post_save, sender=UserProfile)
+def schedule_thumbnails(sender, instance, raw=False, update_fields=None, **kwargs):
+    picture = instance.profile_picture
+    if raw or not picture or picture.name == instance.thumbnail_source:
+        return
+    if update_fields is not None and 'profile_picture' not in update_fields:
+        return
+    from .thumbnails import thumbnail_pool
+    transaction.on_commit(partial(thumbnail_pool.submit, instance.pk, picture.name))
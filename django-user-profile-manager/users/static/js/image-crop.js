@@ -84,6 +84,10 @@ document.addEventListener('DOMContentLoaded', function() {
                                currentInput.closest('.mb-3')?.querySelector('img');
                 
                 if (preview) {
+                    // Drop the server thumbnails so the browser shows the local crop
+                    preview.removeAttribute('srcset');
+                    preview.removeAttribute('sizes');
+                    preview.closest('picture')?.querySelectorAll('source').forEach(source => source.remove());
                     preview.src = canvas.toDataURL('image/jpeg');
                     preview.style.display = 'block';
                 } else {
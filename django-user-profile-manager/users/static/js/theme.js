@@ -26,6 +26,9 @@ document.addEventListener('DOMContentLoaded', function() {
                     reader.onload = function(e) {
                         const preview = document.getElementById('image-preview');
                         if (preview) {
+                            preview.removeAttribute('srcset');
+                            preview.removeAttribute('sizes');
+                            preview.closest('picture')?.querySelectorAll('source').forEach(source => source.remove());
                             preview.src = e.target.result;
                         }
                     };
@@ -1,5 +1,6 @@
 from django import template
 from django.contrib.auth.models import User
+from users.thumbnails import picture_sources
 
 register = template.Library()
 
@@ -24,3 +25,9 @@ def total_profiles():
 @register.simple_tag
 def active_users():
     return User.objects.filter(is_active=True).count()
+
+@register.inclusion_tag('users/includes/avatar.html')
+def avatar(profile, size, css_class='', alt='Profile', img_id=''):
+    return {
+        'sources': picture_sources(profile, size), 'size': size, 'css_class': css_class, 'alt': alt, 'img_id': img_id,
+    }
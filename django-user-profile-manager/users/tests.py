@@ -1,8 +1,18 @@
-from django.test import TestCase, Client
+import shutil
+import tempfile
+import threading
+from io import BytesIO, StringIO
+from unittest import mock
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from django.urls import reverse
 from .models import UserProfile
 from .forms import UserRegisterForm, ProfileUpdateForm
+from .thumbnails import THUMBNAIL_SIZES, ThumbnailPool, picture_sources, thumbnail_name
 
 class UserProfileModelTest(TestCase):
     def setUp(self):
@@ -25,6 +35,19 @@ class UserProfileModelTest(TestCase):
         profile.bio = "Test bio"
         profile.save()
         self.assertEqual(profile.profile_completion_percentage, 40)
+    
+    def test_user_save_skips_clean_profile(self):
+        user = User.objects.get(pk=self.user.pk)
+        with CaptureQueriesContext(connection) as queries:
+            user.save(update_fields=['last_login'])
+        self.assertFalse(any('users_userprofile' in query['sql'] for query in queries))
+        user.profile.location = 'Lahore'
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "users_userprofile"')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"bio"', updates[0])
+        self.assertEqual(UserProfile.objects.get(user=self.user).location, 'Lahore')
 
 class AuthenticationViewsTest(TestCase):
     def setUp(self):
@@ -45,6 +68,11 @@ class AuthenticationViewsTest(TestCase):
         response = self.client.post(reverse('login'), {'username': 'testuser', 'password': 'testpass123'})
         self.assertEqual(response.status_code, 302)
     
+    def test_login_does_not_touch_profile(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(reverse('login'), {'username': 'testuser', 'password': 'testpass123'})
+        self.assertFalse(any('users_userprofile' in query['sql'] for query in queries))
+    
     def test_dashboard_requires_login(self):
         response = self.client.get(reverse('dashboard'))
         self.assertEqual(response.status_code, 302)
@@ -85,3 +113,106 @@ class FormsTest(TestCase):
         }
         form = ProfileUpdateForm(data=form_data)
         self.assertTrue(form.is_valid())
+
+class SQLiteProfileTest(TransactionTestCase):
+    def test_pragmas_applied_on_connect(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+    
+    def test_write_transactions_begin_immediate(self):
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                connection.cursor().execute('SELECT 1')
+        self.assertEqual(queries[0]['sql'], 'BEGIN IMMEDIATE')
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, THUMBNAIL_WORKERS=0)
+class ThumbnailTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.profile = self.user.profile
+    
+    def upload_picture(self, size=(640, 480)):
+        from PIL import Image
+        buffer = BytesIO()
+        Image.new('RGBA', size, (255, 0, 0, 128)).save(buffer, format='PNG')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.profile_picture.save('avatar.png', ContentFile(buffer.getvalue()))
+        self.profile.refresh_from_db()
+        return self.profile.profile_picture.name
+    
+    def test_original_served_until_thumbnails_exist(self):
+        self.profile.profile_picture = 'profile_pics/missing.png'
+        self.assertEqual(picture_sources(self.profile, 100), {'src': '/media/profile_pics/missing.png'})
+    
+    def test_upload_builds_variants(self):
+        name = self.upload_picture()
+        self.assertEqual(self.profile.thumbnail_source, name)
+        for size in THUMBNAIL_SIZES:
+            for extension in ('jpg', 'webp'):
+                self.assertTrue(default_storage.exists(thumbnail_name(name, size, extension)))
+        sources = picture_sources(self.profile, 100)
+        self.assertTrue(sources['src'].endswith('_128.jpg'))
+        self.assertIn('512w', sources['webp_srcset'])
+    
+    def test_small_picture_advertises_real_widths(self):
+        name = self.upload_picture((100, 80))
+        self.assertEqual(self.profile.thumbnail_widths, {'512': 100, '128': 100, '48': 48})
+        sources = picture_sources(self.profile, 100)
+        self.assertEqual(sources['src'], f'/media/{thumbnail_name(name, 128, "jpg")}')
+        self.assertEqual(sources['srcset'], (
+            f'/media/{thumbnail_name(name, 48, "jpg")} 48w, /media/{thumbnail_name(name, 128, "jpg")} 100w'
+        ))
+        self.assertEqual(picture_sources(self.profile, 300)['src'], sources['src'])
+    
+    @override_settings(THUMBNAIL_WORKERS=1, THUMBNAIL_QUEUE_SIZE=0)
+    def test_full_queue_drops_jobs(self):
+        started, release = threading.Event(), threading.Event()
+        
+        def build(pk, name):
+            started.set()
+            release.wait(5)
+        
+        pool = ThumbnailPool()
+        with mock.patch('users.thumbnails.build_thumbnails', side_effect=build) as built:
+            pool.submit(1, 'first.png')
+            started.wait(5)
+            with self.assertLogs('users.thumbnails', 'WARNING'):
+                pool.submit(2, 'second.png')
+            release.set()
+            pool.shutdown()
+        built.assert_called_once_with(1, 'first.png')
+        self.assertEqual(pool._pending, set())
+    
+    def test_personal_info_previews_thumbnail(self):
+        name = self.upload_picture()
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('personal_info'))
+        self.assertContains(response, f'src="/media/{thumbnail_name(name, 128, "jpg")}"')
+        self.assertContains(response, 'id="image-preview"')
+        self.assertNotContains(response, f'src="/media/{name}"')
+    
+    def test_unrelated_save_does_not_rebuild(self):
+        self.upload_picture()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.profile.bio = 'Updated'
+            self.profile.save_dirty_fields()
+        self.assertEqual(callbacks, [])
+    
+    def test_rebuild_command_forces_regeneration(self):
+        from django.core.management import call_command
+        name = self.upload_picture()
+        UserProfile.objects.filter(pk=self.profile.pk).update(thumbnail_source='')
+        call_command('rebuild_thumbnails', workers=1, stdout=StringIO())
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.thumbnail_source, name)
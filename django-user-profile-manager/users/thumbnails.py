@@ -0,0 +1,140 @@
+import logging
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_DIR = 'thumbnails'
+THUMBNAIL_SIZES = (48, 128, 512)
+THUMBNAIL_FORMATS = (('JPEG', 'jpg'), ('WEBP', 'webp'))
+
+
+def thumbnail_name(name, size, extension):
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(THUMBNAIL_DIR, directory, f'{stem}_{size}.{extension}')
+
+
+def flatten(image):
+    if image.mode == 'RGB':
+        return image
+    rgba = image.convert('RGBA')
+    flattened = Image.new('RGB', rgba.size, (255, 255, 255))
+    flattened.paste(rgba, mask=rgba.getchannel('A'))
+    return flattened
+
+
+def generate_thumbnails(name, storage=default_storage):
+    largest = max(THUMBNAIL_SIZES)
+    with storage.open(name) as source, Image.open(source) as image:
+        image.draft('RGB', (largest, largest))
+        variant = flatten(ImageOps.exif_transpose(image))
+    widths = {}
+    for size in sorted(THUMBNAIL_SIZES, reverse=True):
+        variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+        widths[str(size)] = variant.width
+        for image_format, extension in THUMBNAIL_FORMATS:
+            buffer = BytesIO()
+            variant.save(buffer, format=image_format, quality=85)
+            target = thumbnail_name(name, size, extension)
+            storage.delete(target)
+            storage.save(target, ContentFile(buffer.getvalue()))
+    return widths
+
+
+def mark_thumbnails_ready(pk, name, widths):
+    from .models import UserProfile
+    return UserProfile.objects.filter(pk=pk, profile_picture=name).update(
+        thumbnail_source=name, thumbnail_widths=widths,
+    )
+
+
+def build_thumbnails(pk, name):
+    mark_thumbnails_ready(pk, name, generate_thumbnails(name))
+
+
+def picture_sources(profile, size):
+    picture = profile.profile_picture
+    if not picture:
+        return None
+    if profile.thumbnail_source != picture.name or not profile.thumbnail_widths:
+        return {'src': picture.url}
+
+    # Variants are never upscaled, so small originals yield several files of the same width
+    variants = {}
+    for variant_size, width in sorted((int(key), value) for key, value in profile.thumbnail_widths.items()):
+        variants.setdefault(width, variant_size)
+
+    def srcset(extension):
+        return ', '.join(
+            f'{picture.storage.url(thumbnail_name(picture.name, variant_size, extension))} {width}w'
+            for width, variant_size in sorted(variants.items())
+        )
+
+    fallback = min((width for width in variants if width >= size), default=max(variants))
+    return {
+        'src': picture.storage.url(thumbnail_name(picture.name, variants[fallback], 'jpg')),
+        'srcset': srcset('jpg'),
+        'webp_srcset': srcset('webp'),
+    }
+
+
+class ThumbnailPool:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+        self._pending = set()
+
+    def _start(self, workers):
+        with self._lock:
+            if self._executor is None:
+                queue_size = getattr(settings, 'THUMBNAIL_QUEUE_SIZE', workers * 16)
+                self._slots = threading.BoundedSemaphore(workers + queue_size)
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='thumbnails')
+        return self._executor
+
+    def submit(self, pk, name):
+        workers = getattr(settings, 'THUMBNAIL_WORKERS', 2)
+        if workers <= 0:
+            build_thumbnails(pk, name)
+            return
+        executor = self._start(workers)
+        with self._lock:
+            if (pk, name) in self._pending:
+                return
+            self._pending.add((pk, name))
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._pending.discard((pk, name))
+            logger.warning('Thumbnail queue is full, skipping %s', name)
+            return
+        executor.submit(self._run, pk, name)
+
+    def _run(self, pk, name):
+        try:
+            build_thumbnails(pk, name)
+        except Exception:
+            logger.exception('Thumbnail generation failed for %s', name)
+        finally:
+            with self._lock:
+                self._pending.discard((pk, name))
+            self._slots.release()
+            connections.close_all()
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+thumbnail_pool = ThumbnailPool()
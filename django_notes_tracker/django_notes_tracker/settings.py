@@ -53,6 +53,17 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': (
+                'PRAGMA journal_mode = WAL;'
+                'PRAGMA synchronous = NORMAL;'
+                'PRAGMA busy_timeout = 5000;'
+                'PRAGMA cache_size = -20000;'
+                'PRAGMA mmap_size = 134217728;'
+                'PRAGMA temp_store = MEMORY;'
+            ),
+        },
     }
 }
 
@@ -1,4 +1,6 @@
-from django.test import TestCase, Client
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from .models import Note
 
@@ -51,3 +53,18 @@ class NoteViewTest(TestCase):
         response = self.client.post(reverse('delete_note', args=[self.note.id]))
         self.assertEqual(response.status_code, 302)
         self.assertFalse(Note.objects.filter(id=self.note.id).exists())
+
+
+class SQLiteProfileTest(TransactionTestCase):
+    def test_pragmas_applied_on_connect(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+    
+    def test_write_transactions_begin_immediate(self):
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                connection.cursor().execute('SELECT 1')
+        self.assertEqual(queries[0]['sql'], 'BEGIN IMMEDIATE')